@@ -0,0 +1,9 @@
+"""NameTrace scanning engine, importable without the Streamlit UI."""
+from .engine import ScanControl, check_platforms, check_username, iter_fanout, iter_scan, plan_checks
+from .registry import Platform, RegistryError, get_platforms, is_valid_query
+from .variants import query_variants
+
+__all__ = [
+    "Platform", "RegistryError", "ScanControl", "check_platforms", "check_username", "get_platforms",
+    "is_valid_query", "iter_fanout", "iter_scan", "plan_checks", "query_variants",
+]
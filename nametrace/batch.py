@@ -0,0 +1,160 @@
+"""Headless batch scanner: trace many targets and stream results as JSONL.
+
+    python -m nametrace.batch targets.txt -o results.jsonl
+    cat targets.txt | python -m nametrace.batch - --search-type name --resume -o results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .cache import get_result_cache
+from .engine import MAX_WORKERS, check_platforms, scheduled_checks, size_http_session
+from .hosts import warm_host_cache
+from .metrics import start_metrics_server
+from .pool import BATCH_CLASSIFY_WORKERS, set_classify_workers
+from .registry import get_platforms, is_valid_query
+
+# Futures kept in flight per worker; bounds memory no matter how many targets are queued
+QUEUE_DEPTH_PER_WORKER = 4
+
+def read_targets(stream):
+    """Non-empty, non-comment lines of a target list"""
+    for line in stream:
+        target = line.strip()
+        if target and not target.startswith("#"):
+            yield target
+
+def load_checkpoint(path):
+    """(query, search_type, platform) keys already written to a JSONL output"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            done.add((record["query"], record["search_type"], record["platform"]))
+    return done
+
+def terminate_partial_line(path):
+    """Make sure appended records start on a fresh line after an interrupted write"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+def iter_batch(targets, search_type="username", platforms=None, max_workers=MAX_WORKERS,
+               done=frozenset(), bypass_cache=False, on_invalid=None):
+    """Yield a result dict (with a "query" key) for every target x platform check.
+
+    All targets share one worker pool, and only a bounded number of checks is
+    queued at a time, so memory stays flat however long the target list is.
+    """
+    cache = get_result_cache()
+    warm_host_cache()
+
+    def checks():
+        for target in targets:
+            if not is_valid_query(target, search_type):
+                if on_invalid is not None:
+                    on_invalid(target)
+                continue
+            pending = {}
+            for name, info in (platforms or get_platforms()).items():
+                if (target, search_type, name) in done:
+                    continue
+                cached = None if bypass_cache else cache.get((name, target, search_type))
+                if cached is not None:
+                    yield target, None, cached
+                else:
+                    pending[name] = info
+            for members in scheduled_checks(target, pending, search_type):
+                yield target, members, None
+
+    def finish(target, results):
+        for result in results:
+            cache.put((result["platform"], target, search_type), result)
+            yield {"query": target, **result}
+
+    size_http_session(max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+    try:
+        for target, members, cached in checks():
+            if cached is not None:
+                yield {"query": target, **cached}
+                continue
+            future = executor.submit(check_platforms, target, members, search_type)
+            in_flight[future] = target
+            if len(in_flight) >= max_workers * QUEUE_DEPTH_PER_WORKER:
+                completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    yield from finish(in_flight.pop(future), future.result())
+        while in_flight:
+            completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                yield from finish(in_flight.pop(future), future.result())
+    except BaseException:
+        # Interrupted or abandoned (Ctrl-C, generator closed): drop queued checks instead of running them out
+        # (cancelled by hand; shutdown's cancel_futures needs Python 3.9)
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+        raise
+    executor.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trace many usernames or names and write JSONL results")
+    parser.add_argument("targets", help="file with one target per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--search-type", choices=["username", "name"], default="username")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="concurrent checks across all targets")
+    parser.add_argument("--resume", action="store_true", help="skip checks already present in the output file")
+    parser.add_argument("--bypass-cache", action="store_true", help="re-check platforms instead of using cached results")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on 127.0.0.1:PORT/metrics while running")
+    parser.add_argument("--classify-workers", type=int, default=BATCH_CLASSIFY_WORKERS,
+                        help="processes that content-match pages (0: match on the I/O threads)")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+
+    start_metrics_server(args.metrics_port)
+    set_classify_workers(args.classify_workers)
+    done = load_checkpoint(args.output) if args.resume else frozenset()
+    if args.resume:
+        terminate_partial_line(args.output)
+    source = sys.stdin if args.targets == "-" else open(args.targets, encoding="utf-8")
+    out = open(args.output, "a" if args.resume else "w", encoding="utf-8") if args.output else sys.stdout
+
+    def report_invalid(target):
+        print(f"Skipping invalid {args.search_type}: {target}", file=sys.stderr)
+
+    written = 0
+    records = iter_batch(read_targets(source), args.search_type, max_workers=args.workers,
+                         done=done, bypass_cache=args.bypass_cache, on_invalid=report_invalid)
+    try:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            written += 1
+    except KeyboardInterrupt:
+        records.close()
+        print("Interrupted; rerun with --resume to continue", file=sys.stderr)
+        return 130
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"Wrote {written} results", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
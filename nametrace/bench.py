@@ -0,0 +1,254 @@
+"""Benchmark the scan engine against a local mock of every registry host.
+
+    python -m nametrace.bench --scans 20 --engine thread
+    python -m nametrace.bench --engine async --hangs 0.02 --rate-limited 0.05 --json
+
+The mock server runs in its own process and answers for every host in the
+registry. Hosts keep their names, so per-host rate limits and coalescing
+behave as they do live, but they resolve to 127.0.0.1 and speak plain HTTP.
+Each URL gets a reproducible outcome (found, 404, 403, 429, redirect or
+hang) from --seed, and latencies come from a lognormal distribution.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from . import cache, health
+from .engine import SCAN_DEADLINE, SCAN_ENGINES, ScanControl, iter_scan
+from .health import percentile
+from .hosts import get_resolver
+from .pool import CLASSIFY_WORKERS, set_classify_workers
+from .registry import USERNAME_PLACEHOLDER, get_platforms
+
+# Seconds a "hung" response stalls, well past any request timeout
+HANG_SECONDS = 60
+
+class MockProfile:
+    """How the mock server answers: status mix, latency distribution and body sizes"""
+
+    def __init__(self, seed=0, latency_median=0.15, latency_sigma=0.6, body_kb=40,
+                 not_found=0.5, forbidden=0.03, rate_limited=0.02, redirects=0.1, hangs=0.0):
+        self.seed = seed
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.body_kb = body_kb
+        self.not_found = not_found
+        self.forbidden = forbidden
+        self.rate_limited = rate_limited
+        self.redirects = redirects
+        self.hangs = hangs
+
+    def outcome(self, host, path):
+        """("hang" | "redirect" | status code) for a URL; the same on every run with the same seed"""
+        rng = random.Random(zlib.crc32(f"{self.seed}|{host}|{path}".encode()))
+        roll = rng.random()
+        for outcome, share in (("hang", self.hangs), (429, self.rate_limited), (403, self.forbidden),
+                               (404, self.not_found), ("redirect", self.redirects)):
+            if roll < share:
+                return outcome
+            roll -= share
+        return 200
+
+    def latency(self):
+        return random.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+    def body(self):
+        # Valid JSON that also reads as a profile page, so API and page checks both settle on "found"
+        padding = "x" * max(0, self.body_kb * 1024 - 64)
+        return json.dumps({"login": "user", "bio": "profile followers", "padding": padding}).encode()
+
+def make_handler(profile):
+    body = profile.body()
+
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            host = (self.headers.get("Host") or "").split(":")[0]
+            path, _, query = self.path.partition("?")
+            outcome = profile.outcome(host, path)
+            time.sleep(HANG_SECONDS if outcome == "hang" else profile.latency())
+            if outcome == "redirect" and query != "landed":
+                self.send_response(302)
+                self.send_header("Location", f"{path}?landed")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 200 if outcome in ("redirect", "hang") else outcome
+            payload = body if status == 200 else b"<html>user not found</html>"
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.send_header("Content-Type", "application/json" if status == 200 else "text/html")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if self.command == "GET":
+                try:
+                    self.wfile.write(payload)
+                except OSError:
+                    pass  # the client stopped reading early
+
+        do_HEAD = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    return MockHandler
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        pass  # clients drop connections mid-response on purpose (bounded reads, stops, hedges)
+
+def serve(profile, port_pipe):
+    """Mock server process entry point: reports its port, then serves forever"""
+    server = MockServer(("127.0.0.1", 0), make_handler(profile))
+    port_pipe.send(server.server_address[1])
+    server.serve_forever()
+
+def localize(platform, port):
+    """Point a Platform's URLs at the mock server, keeping the host name"""
+    def rewrite(parts):
+        if parts is None:
+            return None
+        url = urlsplit(USERNAME_PLACEHOLDER.join(parts))
+        return tuple(urlunsplit(("http", f"{url.hostname}:{port}", url.path, url.query, "")).split(USERNAME_PLACEHOLDER))
+
+    return platform._replace(
+        url_parts=rewrite(platform.url_parts),
+        check_parts=rewrite(platform.check_parts),
+        name_url_parts=rewrite(platform.name_url_parts),
+    )
+
+def pin_to_mock(platforms, query, search_type):
+    """Resolve every host a scan for `query` contacts, per-user subdomains included, to the mock server"""
+    for platform in platforms.values():
+        host = urlsplit(platform.urls(query, search_type)[0]).hostname
+        if host:
+            get_resolver().pin(host, "127.0.0.1")
+
+def summarize(values):
+    """p50/p95/p99 of a list of seconds, rounded to milliseconds"""
+    values = sorted(values)
+    return {key: round(percentile(values, q), 3) if values else None
+            for key, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_benchmark(profile, scans=10, engine="thread", concurrency=None, deadline=SCAN_DEADLINE, search_type="username"):
+    """Run `scans` scans against a fresh mock server and return the measurements"""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(profile, sender), daemon=True)
+    server.start()
+    try:
+        port = receiver.recv()
+        platforms = {name: localize(p, port) for name, p in get_platforms().items()}
+
+        scan_seconds = []
+        check_seconds = []
+        statuses = {}
+        checks = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for i in range(scans):
+            query = f"benchuser{i}"
+            pin_to_mock(platforms, query, search_type)
+            started = time.perf_counter()
+            for result in iter_scan(query, platforms, search_type, engine, concurrency,
+                                    bypass_cache=True, control=ScanControl(deadline)):
+                checks += 1
+                statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+                if result.get("elapsed") is not None:
+                    check_seconds.append(result["elapsed"])
+            scan_seconds.append(time.perf_counter() - started)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+    finally:
+        server.terminate()
+        server.join()
+
+    return {
+        "engine": engine,
+        "scans": scans,
+        "checks": checks,
+        "checks_per_second": round(checks / wall, 1) if wall else None,
+        "scan_seconds": summarize(scan_seconds),
+        "check_seconds": summarize(check_seconds),
+        "cpu_ms_per_check": round(cpu * 1000 / checks, 3) if checks else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scans against a local mock of every registry host")
+    parser.add_argument("--scans", type=int, default=10, help="number of scans, each with a new query")
+    # Distributed workers resolve platforms from their own registry, out of the mock's reach
+    parser.add_argument("--engine", choices=[e for e in SCAN_ENGINES if e != "distributed"], default="thread")
+    parser.add_argument("--concurrency", type=int, help="workers (thread) or in-flight requests (async)")
+    parser.add_argument("--classify-workers", type=int, default=CLASSIFY_WORKERS,
+                        help="processes that content-match pages (0: match on the I/O threads)")
+    parser.add_argument("--deadline", type=float, default=SCAN_DEADLINE, help="per-scan time limit in seconds")
+    parser.add_argument("--search-type", choices=["username", "name"], default="username")
+    parser.add_argument("--seed", type=int, default=0, help="picks each URL's outcome reproducibly")
+    parser.add_argument("--latency-median", type=float, default=0.15, help="median response latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.6, help="lognormal spread of latencies")
+    parser.add_argument("--body-kb", type=int, default=40, help="size of found-profile bodies")
+    parser.add_argument("--not-found", type=float, default=0.5, help="share of URLs answering 404")
+    parser.add_argument("--forbidden", type=float, default=0.03, help="share of URLs answering 403")
+    parser.add_argument("--rate-limited", type=float, default=0.02, help="share of URLs answering 429")
+    parser.add_argument("--redirects", type=float, default=0.1, help="share of URLs redirecting once")
+    parser.add_argument("--hangs", type=float, default=0.0, help="share of URLs that never answer")
+    parser.add_argument("--json", action="store_true", help="print the measurements as JSON")
+    args = parser.parse_args(argv)
+
+    profile = MockProfile(
+        seed=args.seed, latency_median=args.latency_median, latency_sigma=args.latency_sigma,
+        body_kb=args.body_kb, not_found=args.not_found, forbidden=args.forbidden,
+        rate_limited=args.rate_limited, redirects=args.redirects, hangs=args.hangs,
+    )
+
+    # Keep mock results out of the real result cache and health history
+    workdir = tempfile.mkdtemp(prefix="nametrace-bench-")
+    cache._result_cache = cache.ResultCache(os.path.join(workdir, "cache.sqlite3"))
+    health._health_stats = health.HealthStats(os.path.join(workdir, "health.sqlite3"))
+
+    set_classify_workers(args.classify_workers)
+    report = run_benchmark(profile, args.scans, args.engine, args.concurrency, args.deadline, args.search_type)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"engine            {report['engine']}")
+    print(f"scans / checks    {report['scans']} / {report['checks']}")
+    print(f"checks/sec        {report['checks_per_second']}")
+    for label, key in (("scan latency", "scan_seconds"), ("check latency", "check_seconds")):
+        s = report[key]
+        print(f"{label:<18}p50 {s['p50']}s  p95 {s['p95']}s  p99 {s['p99']}s")
+    print(f"cpu per check     {report['cpu_ms_per_check']} ms")
+    print(f"peak RSS          {report['peak_rss_mb']} MB")
+    print(f"statuses          {report['statuses']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
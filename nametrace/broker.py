@@ -0,0 +1,178 @@
+"""Work-queue brokers that carry check tasks from scan coordinators to worker processes."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Broker for the distributed engine, e.g. sqlite:///.nametrace_queue.sqlite3; unset disables it
+# SQLite brokers serve processes on one host only: WAL locking does not work over network filesystems
+BROKER_URL = os.environ.get("NAMETRACE_BROKER")
+# Seconds a claimed task stays invisible to other workers before it is handed out again
+VISIBILITY_TIMEOUT = 60
+# Claims per task before it is given up as failed (crashed or stuck workers)
+MAX_TASK_ATTEMPTS = 3
+SQLITE_BUSY_TIMEOUT = 30
+
+# One check group: the platforms (by registry name) sharing a request for `query`
+# `expires` is the scan deadline as a Unix time, or None
+Task = namedtuple("Task", ["id", "scan_id", "query", "search_type", "platforms", "expires"])
+
+class Broker:
+    """What the distributed engine needs from a queue; implement these to plug in another backend.
+
+    Delivery is at least once: a task whose lease runs out is handed to
+    another worker, and only the first completion of a task is kept.
+    """
+
+    def submit(self, scan_id, tasks):
+        """Queue (query, search_type, platform names, expires) tuples in order; returns their task ids"""
+        raise NotImplementedError
+
+    def claim(self, worker_id):
+        """Lease the oldest available Task, or return None when there is nothing to do"""
+        raise NotImplementedError
+
+    def complete(self, task_id, results):
+        """Store a leased task's result dicts"""
+        raise NotImplementedError
+
+    def release(self, task_id):
+        """Give a leased task back after a worker-side failure so it can be retried"""
+        raise NotImplementedError
+
+    def collect(self, scan_id):
+        """Take the [(task_id, results), ...] delivered so far; results is None for a task that failed for good"""
+        raise NotImplementedError
+
+    def cancel(self, scan_id):
+        """Drop a scan's outstanding tasks and undelivered results"""
+        raise NotImplementedError
+
+class SQLiteBroker(Broker):
+    """Broker backed by one SQLite file shared by worker processes on the same machine.
+
+    Not for network filesystems (NFS, SMB): WAL mode needs shared memory
+    on the local host. Spreading workers over several hosts needs another
+    Broker implementation.
+    """
+
+    def __init__(self, path, visibility_timeout=VISIBILITY_TIMEOUT, max_attempts=MAX_TASK_ATTEMPTS):
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # Transactions are explicit so a claim can take the write lock before it reads
+        self.db = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, scan_id TEXT, payload TEXT, state TEXT DEFAULT 'queued', "
+            "attempts INTEGER DEFAULT 0, lease_until REAL, worker TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, id)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, scan_id TEXT, task_id INTEGER, results TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_scan ON results (scan_id, id)")
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT around a block, serialized within this process"""
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.db
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def submit(self, scan_id, tasks):
+        ids = []
+        with self.transaction() as db:
+            for query, search_type, platforms, expires in tasks:
+                payload = json.dumps({"query": query, "search_type": search_type, "platforms": platforms,
+                                      "expires": expires})
+                ids.append(db.execute("INSERT INTO tasks (scan_id, payload) VALUES (?, ?)", (scan_id, payload)).lastrowid)
+        return ids
+
+    def claim(self, worker_id):
+        now = time.time()
+        with self.transaction() as db:
+            while True:
+                row = db.execute(
+                    "SELECT id, scan_id, payload, attempts FROM tasks "
+                    "WHERE state = 'queued' OR (state = 'leased' AND lease_until < ?) ORDER BY id LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    return None
+                task_id, scan_id, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    self._fail(db, task_id, scan_id)
+                    continue
+                db.execute(
+                    "UPDATE tasks SET state = 'leased', attempts = attempts + 1, lease_until = ?, worker = ? WHERE id = ?",
+                    (now + self.visibility_timeout, worker_id, task_id)
+                )
+                fields = json.loads(payload)
+                return Task(task_id, scan_id, fields["query"], fields["search_type"], fields["platforms"],
+                            fields["expires"])
+
+    def complete(self, task_id, results):
+        with self.transaction() as db:
+            row = db.execute("SELECT scan_id FROM tasks WHERE id = ? AND state = 'leased'", (task_id,)).fetchone()
+            if row is None:
+                return  # already completed by another worker, given up, or cancelled
+            db.execute("UPDATE tasks SET state = 'done' WHERE id = ?", (task_id,))
+            db.execute("INSERT INTO results (scan_id, task_id, results) VALUES (?, ?, ?)",
+                       (row[0], task_id, json.dumps(results)))
+
+    def release(self, task_id):
+        with self.transaction() as db:
+            row = db.execute("SELECT scan_id, attempts FROM tasks WHERE id = ? AND state = 'leased'", (task_id,)).fetchone()
+            if row is None:
+                return
+            if row[1] >= self.max_attempts:
+                self._fail(db, task_id, row[0])
+            else:
+                db.execute("UPDATE tasks SET state = 'queued', lease_until = NULL WHERE id = ?", (task_id,))
+
+    def _fail(self, db, task_id, scan_id):
+        db.execute("UPDATE tasks SET state = 'failed' WHERE id = ?", (task_id,))
+        db.execute("INSERT INTO results (scan_id, task_id, results) VALUES (?, ?, NULL)", (scan_id, task_id))
+
+    def collect(self, scan_id):
+        with self.transaction() as db:
+            rows = db.execute("SELECT id, task_id, results FROM results WHERE scan_id = ? ORDER BY id", (scan_id,)).fetchall()
+            if rows:
+                db.execute("DELETE FROM results WHERE scan_id = ? AND id <= ?", (scan_id, rows[-1][0]))
+                db.execute("DELETE FROM tasks WHERE scan_id = ? AND state IN ('done', 'failed')", (scan_id,))
+        return [(task_id, None if results is None else json.loads(results)) for _, task_id, results in rows]
+
+    def cancel(self, scan_id):
+        with self.transaction() as db:
+            db.execute("DELETE FROM tasks WHERE scan_id = ?", (scan_id,))
+            db.execute("DELETE FROM results WHERE scan_id = ?", (scan_id,))
+
+def open_broker(url, **options):
+    """Broker for a URL; sqlite:///relative/path and sqlite:////absolute/path are built in"""
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(url[len("sqlite:///"):], **options)
+    raise ValueError(f"Unsupported broker URL: {url}")
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker():
+    """Process-wide broker from NAMETRACE_BROKER"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if not BROKER_URL:
+                raise RuntimeError("The distributed scan engine requires NAMETRACE_BROKER, e.g. sqlite:///queue.sqlite3")
+            _broker = open_broker(BROKER_URL)
+        return _broker
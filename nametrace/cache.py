@@ -0,0 +1,86 @@
+"""TTL result cache shared by every scan in the process."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Result cache: seconds each status stays fresh; errors get a short negative TTL
+CACHE_PATH = os.environ.get("NAMETRACE_CACHE_PATH", ".nametrace_cache.sqlite3")
+CACHE_MEMORY_ENTRIES = 10000
+CACHE_TTLS = {
+    "found": 6 * 3600,
+    "not_found": 3600,
+    "private/blocked": 1800,
+}
+ERROR_CACHE_TTL = 60
+
+class ResultCache:
+    """TTL cache of check results: an in-memory LRU in front of a SQLite table"""
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "platform TEXT, query TEXT, search_type TEXT, expires REAL, result TEXT, "
+                "PRIMARY KEY (platform, query, search_type))"
+            )
+            self.db.execute("DELETE FROM results WHERE expires < ?", (time.time(),))
+
+    @staticmethod
+    def ttl_for(result):
+        return CACHE_TTLS.get(result["status"], ERROR_CACHE_TTL)
+
+    def get(self, key):
+        """Cached result for (platform, query, search_type), or None when missing or stale"""
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is None:
+                row = self.db.execute(
+                    "SELECT expires, result FROM results WHERE platform = ? AND query = ? AND search_type = ?", key
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = (row[0], json.loads(row[1]))
+                self._remember(key, entry)
+            else:
+                self.memory.move_to_end(key)
+            
+            expires, result = entry
+            if expires < now:
+                del self.memory[key]
+                return None
+        return {**result, "cached": True}
+
+    def put(self, key, result):
+        entry = (time.time() + self.ttl_for(result), result)
+        with self.lock:
+            self._remember(key, entry)
+            with self.db:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (*key, entry[0], json.dumps(result))
+                )
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache():
+    """Process-wide result cache shared by every analyst session"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
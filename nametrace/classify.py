@@ -0,0 +1,127 @@
+"""Content classification: turn a response status and body into a check status."""
+import json
+
+try:
+    import ahocorasick
+except ImportError:  # content matching falls back to substring scans
+    ahocorasick = None
+
+# Common false positive patterns to filter out
+FALSE_POSITIVE_PATTERNS = [
+    "user not found", "user does not exist", "page not found", "profile not found",
+    "account suspended", "account deactivated", "account deleted", "user suspended",
+    "this page doesn't exist", "sorry, this page isn't available", "page doesn't exist",
+    "no user found", "invalid user", "user not available", "profile unavailable",
+    "account not found", "username not found", "profile does not exist",
+    "the page you requested does not exist", "404 not found", "page not available",
+    "user has been suspended", "account has been suspended", "profile has been removed",
+    "this account doesn't exist", "sorry, that page doesn't exist", "page cannot be found",
+    "user profile not found", "no such user", "user doesn't exist", "invalid username",
+    "account does not exist", "profile not available", "user not registered",
+    "this user does not exist", "profile cannot be found", "account unavailable"
+]
+
+# Phrases that suggest a real profile page
+POSITIVE_INDICATORS = [
+    "profile", "posts", "followers", "following", "about",
+    "bio", "description", "joined", "member since",
+    "tweets", "photos", "videos", "activity"
+]
+
+# Extra not-found rules per platform (lowercase name); every phrase of a rule must appear
+PLATFORM_NOT_FOUND_RULES = {
+    "wikipedia": [["does not exist"], ["page does not exist"]],
+    "wikimedia": [["does not exist"], ["page does not exist"]],
+    "github": [["not found", "404"]],
+    "twitter": [["account suspended"], ["user not found"]],
+    "x": [["account suspended"], ["user not found"]],
+    "instagram": [["page not found"], ["user not found"]],
+    "linkedin": [["profile not found"], ["member not found"]],
+}
+
+class PatternMatcher:
+    """Find every occurrence of a fixed set of lowercase phrases in one pass"""
+
+    def __init__(self, patterns):
+        self.patterns = sorted(set(patterns))
+        self.overlap = max(len(pattern) for pattern in self.patterns) - 1
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for pattern in self.patterns:
+                self.automaton.add_word(pattern, pattern)
+            self.automaton.make_automaton()
+        else:
+            self.automaton = None
+
+    def find_all(self, text, hits=None):
+        """Add every pattern found in `text` to `hits` and return it"""
+        if hits is None:
+            hits = set()
+        if self.automaton is not None:
+            hits.update(pattern for _, pattern in self.automaton.iter(text))
+        else:
+            hits.update(pattern for pattern in self.patterns if pattern not in hits and pattern in text)
+        return hits
+
+CONTENT_MATCHER = PatternMatcher(
+    FALSE_POSITIVE_PATTERNS + POSITIVE_INDICATORS
+    + [phrase for rules in PLATFORM_NOT_FOUND_RULES.values() for rule in rules for phrase in rule]
+)
+_FALSE_POSITIVE_SET = frozenset(FALSE_POSITIVE_PATTERNS)
+_POSITIVE_SET = frozenset(POSITIVE_INDICATORS)
+
+def has_false_positive(hits):
+    """Whether any generic not-found phrase was matched"""
+    return not _FALSE_POSITIVE_SET.isdisjoint(hits)
+
+def not_found_rules_for(platform_name):
+    """Compiled PLATFORM_NOT_FOUND_RULES entry for a platform"""
+    return tuple(frozenset(rule) for rule in PLATFORM_NOT_FOUND_RULES.get(platform_name.lower(), ()))
+
+def content_is_not_found(hits, rules=()):
+    """True once the matched phrases settle a page as a false positive"""
+    if has_false_positive(hits):
+        return True
+    return any(hits.issuperset(rule) for rule in rules)
+
+def classify_content(hits, rules=()):
+    """Status of a 200 page from the phrases found in it"""
+    if content_is_not_found(hits, rules):
+        return "not_found"
+    if not _POSITIVE_SET.isdisjoint(hits):
+        return "found"
+    return "not_found"
+
+def classify_response(platform, status_code, text, hits=None):
+    """Turn a response status code and body (or its matched phrases) into a check status"""
+    # API-based checks with enhanced validation
+    if platform.api:
+        if status_code == 200:
+            try:
+                data = json.loads(text)
+                if data and (isinstance(data, dict) or (isinstance(data, list) and len(data) > 0)):
+                    # Additional validation for API responses
+                    if isinstance(data, dict):
+                        if data.get("message") == "Not Found" or data.get("error"):
+                            return "not_found"
+                        return "found"
+                    return "found"
+                return "not_found"
+            except json.JSONDecodeError:
+                return "error"
+        elif status_code == 404:
+            return "not_found"
+        return "error"
+
+    # Enhanced status code and content based checks
+    if status_code == 200:
+        if hits is None:
+            hits = CONTENT_MATCHER.find_all(text.lower())
+        return classify_content(hits, platform.not_found_rules)
+    elif status_code == 404:
+        return "not_found"
+    elif status_code == 403:
+        return "private/blocked"
+    elif status_code == 429:
+        return "rate_limited"
+    return "error"
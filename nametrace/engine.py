@@ -0,0 +1,1046 @@
+"""Scan engines: pooled HTTP fetching, request coalescing and result streaming."""
+import asyncio
+import codecs
+import errno
+import importlib.util
+import queue
+import socket
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+
+from .broker import BROKER_URL, get_broker
+from .cache import get_result_cache
+from .classify import CONTENT_MATCHER, classify_response, has_false_positive
+from .health import get_health_stats
+from .hosts import CachedDNSAdapter, aiohttp_resolver, get_dead_hosts, warm_host_cache
+from .metrics import PHASES, RequestPhases, aiohttp_trace_config, capture_phases, get_scan_metrics
+from .pool import get_classifier_pool, submit_match
+from .ratelimit import RATE_LIMIT_RETRIES, get_rate_limiter, parse_retry_after
+from .registry import as_platform, platform_hosts
+from .retry import RETRY_STATUSES, backoff_delay, get_latency_history, hedge_delay, retry_policy_for
+
+# Scan engine settings
+MAX_WORKERS = 20
+REQUEST_TIMEOUT = 12
+ASYNC_CONCURRENCY = 200
+MAX_BODY_BYTES = 512 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+# Whole-scan time budget (seconds) and how often a waiting scan checks for Stop
+SCAN_DEADLINE = 30
+STOP_POLL_INTERVAL = 0.1
+# How long an abandoned async scan may take to cancel its tasks and release their rate-limit slots
+STOP_JOIN_TIMEOUT = 1.0
+
+# Probe statuses that settle a check without fetching the full page
+PROBE_DECISIVE_STATUSES = {404, 403, 429}
+RANGE_PROBE_HEADERS = {"Range": "bytes=0-0"}
+
+SCAN_ENGINES = ["thread", "async", "distributed"]
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
+
+def build_http_session(pool_size=MAX_WORKERS):
+    """Create a keep-alive session with one connection pool per platform host"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # Checks must not leak cookies into each other through the shared jar
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = CachedDNSAdapter(
+        pool_connections=len(platform_hosts()),
+        pool_maxsize=pool_size,
+        max_retries=0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_http_session = None
+_http_pool_size = MAX_WORKERS
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Process-wide session shared by every scan so connections survive reruns"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = build_http_session(_http_pool_size)
+        return _http_session
+
+def size_http_session(pool_size):
+    """Let the shared session keep `pool_size` connections per host.
+
+    Pools only grow: a larger worker count rebuilds the session once
+    (requests in flight finish on the old one), smaller ones reuse it.
+    """
+    global _http_session, _http_pool_size
+    with _http_session_lock:
+        if pool_size <= _http_pool_size:
+            return
+        _http_pool_size = pool_size
+        if _http_session is not None:
+            _http_session = build_http_session(pool_size)
+
+def aiohttp_available():
+    """Whether the optional asyncio engine can run"""
+    return importlib.util.find_spec("aiohttp") is not None
+
+def engine_available(engine):
+    """Whether a scan engine can run here: asyncio needs aiohttp, distributed needs NAMETRACE_BROKER"""
+    if engine == "async":
+        return aiohttp_available()
+    if engine == "distributed":
+        return bool(BROKER_URL)
+    return engine in SCAN_ENGINES
+
+class ScanStopped(Exception):
+    """The scan was stopped or ran out of time before a check finished"""
+
+class HostUnreachable(Exception):
+    """The platform's host does not resolve or refuses connections"""
+
+class RequestAbandoned(Exception):
+    """The scan that owned a shared request stopped; a joiner should make the request itself"""
+
+class ScanControl:
+    """Deadline, Stop flag and optional ScanTimeline shared by a scan and the checks it started"""
+
+    def __init__(self, deadline=None, timeline=None):
+        self.expires = None if deadline is None else time.monotonic() + deadline
+        self.stop_event = threading.Event()
+        self.timeline = timeline
+
+    def cancel(self):
+        self.stop_event.set()
+
+    def remaining(self):
+        """Seconds left in the budget (None without a deadline); 0 once stopped"""
+        if self.stop_event.is_set():
+            return 0.0
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def stopped(self):
+        return self.remaining() == 0.0
+
+    def timeout(self):
+        """Per-request timeout, never running past the scan deadline"""
+        remaining = self.remaining()
+        if remaining == 0.0:
+            raise ScanStopped()
+        return REQUEST_TIMEOUT if remaining is None else min(REQUEST_TIMEOUT, remaining)
+
+    def sleep(self, seconds):
+        """Wait out a rate-limit delay unless the scan stops first"""
+        remaining = self.remaining()
+        if remaining is not None and seconds >= remaining:
+            raise ScanStopped()
+        if self.stop_event.wait(seconds):
+            raise ScanStopped()
+
+# Used by checks run outside a scan: no deadline, never stopped
+_UNBOUNDED = ScanControl()
+
+def probe_settles(status_code):
+    """Whether a probe status alone decides the check (probes are never used for API entries)"""
+    return status_code in PROBE_DECISIVE_STATUSES
+
+def build_result(platform, display_url, status, search_type="username", response_code=None, error=None):
+    """Result dict shared by every scan engine"""
+    result = {
+        "platform": platform.name,
+        "url": display_url,
+        "status": status,
+        "response_code": response_code,
+        "is_leak_db": platform.leak_db,
+        "search_type": search_type
+    }
+    if error is not None:
+        result["error"] = str(error)[:100]
+    return result
+
+class BodyReader:
+    """Incrementally decode a size-capped response body.
+
+    With `match_content`, chunks are run through CONTENT_MATCHER as they
+    arrive instead of being kept, and reading stops at the first false
+    positive phrase since that settles the page for every platform.
+    """
+
+    def __init__(self, encoding, match_content=False, max_bytes=MAX_BODY_BYTES):
+        try:
+            decoder_class = codecs.getincrementaldecoder(encoding or "utf-8")
+        except LookupError:
+            decoder_class = codecs.getincrementaldecoder("utf-8")
+        self.decoder = decoder_class(errors="replace")
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.hits = set() if match_content else None
+        self.parts = []
+        self.tail = ""
+
+    def feed(self, chunk):
+        """Consume a chunk of bytes; returns True once reading can stop"""
+        chunk = chunk[:self.max_bytes - self.bytes_read]
+        self.bytes_read += len(chunk)
+        capped = self.bytes_read >= self.max_bytes
+        text = self.decoder.decode(chunk, final=capped)
+        
+        if self.hits is None:
+            self.parts.append(text)
+        elif text:
+            # Keep the end of the previous chunk so phrases split across chunks still match
+            window = self.tail + text.lower()
+            CONTENT_MATCHER.find_all(window, self.hits)
+            if has_false_positive(self.hits):
+                return True
+            self.tail = window[-CONTENT_MATCHER.overlap:]
+        return capped
+
+    def text(self):
+        self.parts.append(self.decoder.decode(b"", final=True))
+        return "".join(self.parts)
+
+class RawBodyReader:
+    """Collect a size-capped page body as raw bytes for the classifier pool.
+
+    Nothing is decoded or lowercased on the I/O thread; the bytes go to a
+    classifier process as they are, and `submit()` returns a Future of the
+    matched phrases.
+    """
+
+    def __init__(self, encoding, pool, max_bytes=MAX_BODY_BYTES):
+        self.encoding = encoding
+        self.pool = pool
+        self.max_bytes = max_bytes
+        self.body = bytearray()
+        self.hits = None
+
+    @property
+    def bytes_read(self):
+        return len(self.body)
+
+    def feed(self, chunk):
+        """Consume a chunk of bytes; returns True once the size cap is reached"""
+        room = self.max_bytes - len(self.body)
+        self.body += chunk if len(chunk) <= room else chunk[:room]
+        return len(self.body) >= self.max_bytes
+
+    def submit(self):
+        return submit_match(self.pool, self.body, self.encoding)
+
+    def text(self):
+        return ""
+
+def body_reader_for(api, status_code, encoding):
+    """Only plain 200 pages are content-matched: in the classifier pool when one runs, else while streaming"""
+    match_content = status_code == 200 and not api
+    pool = get_classifier_pool() if match_content else None
+    if pool is not None:
+        return RawBodyReader(encoding, pool)
+    return BodyReader(encoding, match_content=match_content)
+
+# What a single request yields for classification; shared by every platform using the same URL
+# `elapsed` is time on the wire, excluding rate-limit waits before the first request
+# `timings` maps phases to seconds (classify only for pool-matched pages); `bytes_received` counts body bytes read
+# `spans` lists (phase, start, end) monotonic times, rate-limit waits included, for scan timelines
+FetchOutcome = namedtuple(
+    "FetchOutcome", ["status_code", "text", "hits", "retry_after", "elapsed", "timings", "bytes_received", "spans"],
+    defaults=[None, None, None, None, None]
+)
+TIMEOUT_ERRORS = (requests.exceptions.Timeout, asyncio.TimeoutError)
+# Failures worth another attempt under a RetryPolicy; timeouts are left to hedging instead
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError)
+
+def connect_failed(error, full_timeout=True):
+    """Whether a requests error means the host cannot be reached at all.
+
+    A connect timeout only counts when the request had the full REQUEST_TIMEOUT,
+    not one cut short by the scan deadline.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return full_timeout
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    reason = getattr(error.args[0], "reason", None)
+    if isinstance(reason, NameResolutionError):
+        cause = reason.__cause__
+        return isinstance(cause, socket.gaierror) and cause.errno == socket.EAI_NONAME
+    # Only a refusal is about the host; ENETUNREACH, EMFILE, ENOBUFS, ... are trouble on this machine
+    return isinstance(reason, NewConnectionError) and getattr(reason.__cause__, "errno", None) == errno.ECONNREFUSED
+
+def connect_failed_async(error):
+    """Asyncio counterpart of connect_failed"""
+    import aiohttp
+    
+    if not isinstance(error, aiohttp.ClientConnectorError):
+        return False
+    if isinstance(error.os_error, socket.gaierror):
+        return error.os_error.errno == socket.EAI_NONAME
+    return error.os_error.errno == errno.ECONNREFUSED
+
+def dead_host_results(query, members, search_type, host):
+    """Results for a host on the dead-host list, or None when it may be contacted"""
+    if host is None or not get_dead_hosts().is_dead(host):
+        return None
+    return build_results(query, members, search_type, error=HostUnreachable(f"{host} is unreachable"))
+
+def fetch_key(query, platform, search_type="username"):
+    """Identifies the request a check needs: (check_url, api, probe)"""
+    check_url, _ = platform.urls(query, search_type)
+    return (check_url, platform.api, platform.probe_for(search_type))
+
+def plan_checks(query, platforms, search_type="username"):
+    """Group platforms that resolve to the same request so each one is fetched once"""
+    groups = defaultdict(list)
+    for name, info in platforms.items():
+        platform = as_platform(name, info)
+        groups[fetch_key(query, platform, search_type)].append(platform)
+    return groups
+
+def scheduled_checks(query, platforms, search_type="username"):
+    """plan_checks groups in submission order: slowest first, chronically broken platforms last"""
+    return get_health_stats().schedule(list(plan_checks(query, platforms, search_type).values()))
+
+def scheduled_fanout(targets, search_type="username"):
+    """(query, members) checks for every query -> platforms entry of `targets`, in submission order.
+
+    Checks keep the health-based order of scheduled_checks, but each host's
+    checks are dealt out over successive rounds instead of queued back to
+    back, so one rate-limited host never ties up several workers at once.
+    """
+    checks = [
+        (query, members)
+        for query, platforms in targets.items()
+        for members in plan_checks(query, platforms, search_type).values()
+    ]
+    ranked = get_health_stats().schedule([members for _, members in checks])
+    rank = {id(members): position for position, members in enumerate(ranked)}
+    host_round = Counter()
+    keyed = []
+    for query, members in sorted(checks, key=lambda check: rank[id(check[1])]):
+        host = urlparse(fetch_key(query, members[0], search_type)[0]).hostname
+        keyed.append((host_round[host], rank[id(members)], query, members))
+        host_round[host] += 1
+    keyed.sort(key=lambda entry: entry[:2])
+    return [(query, members) for _, _, query, members in keyed]
+
+class InflightRequests:
+    """Lets concurrent scans share one outstanding request per fetch key"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+
+    def claim(self, key):
+        """Return (future, owner); only the owner performs the request"""
+        with self.lock:
+            future = self.pending.get(key)
+            if future is not None:
+                return future, False
+            future = self.pending[key] = Future()
+            return future, True
+
+    def settle(self, key, future, outcome=None, error=None):
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(outcome)
+
+_inflight = InflightRequests()
+
+def get_inflight_requests():
+    """Process-wide in-flight registry shared by every scan"""
+    return _inflight
+
+def wait_for_host(limiter, host, control=_UNBOUNDED):
+    """Wait for the host's next rate-limit slot, handing it back if the scan stops first"""
+    try:
+        control.sleep(limiter.reserve(host))
+    except ScanStopped:
+        limiter.refund(host)
+        raise
+
+def probe_status(session, check_url, probe, control=_UNBOUNDED):
+    """(status code, Retry-After seconds) of a HEAD or single-byte ranged GET probe"""
+    if probe == "head":
+        response = session.head(check_url, timeout=control.timeout(), allow_redirects=True)
+        return response.status_code, parse_retry_after(response.headers.get("Retry-After"))
+    with session.get(check_url, headers=RANGE_PROBE_HEADERS, timeout=control.timeout(),
+                     allow_redirects=True, stream=True) as response:
+        return response.status_code, parse_retry_after(response.headers.get("Retry-After"))
+
+def fetch_once(session, limiter, host, check_url, api, probe, control=_UNBOUNDED, on_send=None):
+    """One attempt at the request behind a fetch key; `on_send` runs once it clears the rate limiter"""
+    phases = RequestPhases()
+    with phases.timed("rate_limit"):
+        wait_for_host(limiter, host, control)
+    if on_send is not None:
+        on_send()
+    sent = time.monotonic()
+    with capture_phases(phases):
+        if probe is not None:
+            with phases.timed("ttfb"):
+                status_code, retry_after = probe_status(session, check_url, probe, control)
+            if probe_settles(status_code):
+                return FetchOutcome(status_code, "", None, retry_after, time.monotonic() - sent, phases.seconds, 0,
+                                    phases.spans)
+            with phases.timed("rate_limit"):
+                wait_for_host(limiter, host, control)
+        
+        with phases.timed("ttfb"):
+            response = session.get(check_url, timeout=control.timeout(), allow_redirects=True, stream=True)
+        with response, phases.timed("download"):
+            reader = body_reader_for(api, response.status_code, response.encoding)
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+                if control.stopped:
+                    raise ScanStopped()
+    elapsed = time.monotonic() - sent
+    hits = reader.hits
+    if isinstance(reader, RawBodyReader):
+        with phases.timed("classify"):
+            # A hung classifier process must not outlive the scan's Stop or deadline
+            hits = wait_result(reader.submit(), control)
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    return FetchOutcome(response.status_code, reader.text(), hits, retry_after, elapsed,
+                        phases.seconds, reader.bytes_read, phases.spans)
+
+def run_in_thread(fn, *args):
+    """Start fn(*args) on its own daemon thread, returning a Future for the result"""
+    future = Future()
+    
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name="nametrace-hedge", daemon=True).start()
+    return future
+
+def fetch_attempt(session, limiter, host, check_url, api, probe, control=_UNBOUNDED, hedge_after=None):
+    """fetch_once, plus a duplicate request if the first is still running after `hedge_after` seconds.
+
+    The first successful answer wins; a losing request finishes in the background.
+    """
+    if hedge_after is None:
+        return fetch_once(session, limiter, host, check_url, api, probe, control)
+    sent = threading.Event()
+    attempts = [run_in_thread(fetch_once, session, limiter, host, check_url, api, probe, control, sent.set)]
+    attempts[0].add_done_callback(lambda _: sent.set())
+    # The hedge clock starts once the request is on the wire, not while it queues for the host
+    sent.wait()
+    done, _ = wait(attempts, timeout=hedge_after)
+    if not done and not control.stopped:
+        attempts.append(run_in_thread(fetch_once, session, limiter, host, check_url, api, probe, control))
+    error = None
+    for future in as_completed(attempts):
+        try:
+            return future.result()
+        except Exception as e:
+            error = e
+    raise error
+
+def backoff_before_retry(policy, failures, control=_UNBOUNDED):
+    """Sleep before retry number `failures`; False when the policy or the deadline rules it out"""
+    if failures >= policy.attempts:
+        return False
+    delay = backoff_delay(policy, failures)
+    remaining = control.remaining()
+    if remaining is not None and delay >= remaining:
+        return False
+    control.sleep(delay)
+    return True
+
+def backoff_fits(limiter, host, control=_UNBOUNDED):
+    """Whether the host's 429 back-off ends before the deadline; if not, the 429 is the answer"""
+    remaining = control.remaining()
+    return remaining is None or limiter.blocked_for(host) < remaining
+
+def fetch_check(session, check_url, api, probe, control=_UNBOUNDED):
+    """Perform the request behind a fetch key.
+
+    429s are retried after the host backs off. Connection failures and
+    gateway errors are retried with jittered exponential backoff under the
+    key's RetryPolicy, and attempts slower than the host's p95 may be hedged.
+    """
+    host = urlparse(check_url).hostname
+    limiter = get_rate_limiter()
+    policy = retry_policy_for(api)
+    rate_limited = failures = 0
+    while True:
+        try:
+            outcome = fetch_attempt(session, limiter, host, check_url, api, probe, control, hedge_delay(host, policy))
+        except TIMEOUT_ERRORS:
+            raise
+        except TRANSIENT_ERRORS:
+            failures += 1
+            if backoff_before_retry(policy, failures, control):
+                continue
+            raise
+        limiter.record(host, outcome)
+        if outcome.status_code == 429 and rate_limited < RATE_LIMIT_RETRIES and backoff_fits(limiter, host, control):
+            rate_limited += 1
+            continue
+        if outcome.status_code in RETRY_STATUSES:
+            failures += 1
+            if backoff_before_retry(policy, failures, control):
+                continue
+        elif outcome.status_code != 429:
+            get_latency_history().record(host, outcome.elapsed)
+        return outcome
+
+def wait_result(future, control=_UNBOUNDED):
+    """Result of a future run elsewhere (another scan's request, a classifier process), given up if this scan stops"""
+    while True:
+        try:
+            return future.result(timeout=STOP_POLL_INTERVAL)
+        except FuturesTimeoutError:
+            if control.stopped:
+                raise ScanStopped() from None
+
+def fetch_coalesced(key, control=_UNBOUNDED):
+    """fetch_check, joining an identical request already in flight if there is one"""
+    inflight = get_inflight_requests()
+    while True:
+        future, owner = inflight.claim(key)
+        if owner:
+            break
+        try:
+            return wait_result(future, control)
+        except RequestAbandoned:
+            continue  # the owner's scan stopped; take the request over
+    try:
+        outcome = fetch_check(get_http_session(), *key, control=control)
+    except Exception as e:
+        # A failure caused by this scan's Stop or deadline says nothing about the request itself
+        inflight.settle(key, future, error=RequestAbandoned() if control.stopped else e)
+        raise
+    except BaseException:
+        inflight.settle(key, future, error=RequestAbandoned())
+        raise
+    inflight.settle(key, future, outcome)
+    return outcome
+
+def build_results(query, members, search_type, outcome=None, error=None, elapsed=None):
+    """Classify one fetch outcome (or failure) for every platform that shares it"""
+    results = []
+    for platform in members:
+        _, display_url = platform.urls(query, search_type)
+        if isinstance(error, ScanStopped):
+            result = build_result(platform, display_url, "pending", search_type)
+        elif isinstance(error, HostUnreachable):
+            result = build_result(platform, display_url, "host_unreachable", search_type, error=error)
+        elif isinstance(error, TIMEOUT_ERRORS):
+            result = build_result(platform, display_url, "timeout", search_type)
+        elif error is not None:
+            result = build_result(platform, display_url, "error", search_type, error=error)
+        else:
+            classifying = time.monotonic()
+            status = classify_response(platform, outcome.status_code, outcome.text, outcome.hits)
+            result = build_result(platform, display_url, status, search_type, outcome.status_code)
+            timings = dict(outcome.timings or {})
+            # Pool-matched pages already spent part of their classify time in fetch_once
+            timings["classify"] = timings.get("classify", 0.0) + time.monotonic() - classifying
+            result["timings"] = {phase: round(timings[phase], 4) for phase in PHASES if phase in timings}
+            result["bytes_received"] = outcome.bytes_received
+        if elapsed is not None and result["status"] != "pending":
+            result["elapsed"] = round(elapsed, 3)
+        results.append(result)
+    return results
+
+def check_platforms(query, members, search_type="username", control=_UNBOUNDED):
+    """Check a group of Platform records that share one fetch key"""
+    key = fetch_key(query, members[0], search_type)
+    host = urlparse(key[0]).hostname
+    dead = dead_host_results(query, members, search_type, host)
+    if dead is not None:
+        return dead
+    timeline = control.timeline
+    lane = timeline.acquire_lane() if timeline is not None else None
+    budget = control.remaining()
+    started = time.monotonic()
+    spans = ()
+    try:
+        outcome = fetch_coalesced(key, control)
+    except Exception as e:
+        full_timeout = budget is None or budget >= REQUEST_TIMEOUT
+        if not full_timeout and control.stopped:
+            # The request was cut short by the deadline: no answer (and nothing to cache or learn from)
+            e = ScanStopped()
+        elif connect_failed(e, full_timeout):
+            get_dead_hosts().mark(host)
+            e = HostUnreachable(e)
+        results = build_results(query, members, search_type, error=e, elapsed=time.monotonic() - started)
+    else:
+        classifying = time.monotonic()
+        results = build_results(query, members, search_type, outcome, elapsed=outcome.elapsed)
+        spans = [*(outcome.spans or ()), ("classify", classifying, time.monotonic())]
+    if timeline is not None:
+        timeline.record_check(lane, host, results, started, time.monotonic(), spans)
+        timeline.release_lane(lane)
+    get_health_stats().record(results)
+    get_scan_metrics().record(results)
+    return results
+
+def check_username(query, platform_name, platform_info, search_type="username"):
+    """Enhanced check with better false positive filtering"""
+    return check_platforms(query, [as_platform(platform_name, platform_info)], search_type)[0]
+
+async def wait_for_host_async(limiter, host):
+    """Asyncio counterpart of wait_for_host; cancellation hands the slot back"""
+    try:
+        await asyncio.sleep(limiter.reserve(host))
+    except asyncio.CancelledError:
+        limiter.refund(host)
+        raise
+
+async def probe_status_async(session, check_url, probe, phases=None):
+    """Asyncio counterpart of probe_status"""
+    if probe == "head":
+        async with session.head(check_url, allow_redirects=True, trace_request_ctx=phases) as response:
+            return response.status, parse_retry_after(response.headers.get("Retry-After"))
+    async with session.get(check_url, headers=RANGE_PROBE_HEADERS, allow_redirects=True,
+                           trace_request_ctx=phases) as response:
+        return response.status, parse_retry_after(response.headers.get("Retry-After"))
+
+async def fetch_once_async(session, limiter, host, check_url, api, probe, on_send=None):
+    """Asyncio counterpart of fetch_once"""
+    phases = RequestPhases()
+    with phases.timed("rate_limit"):
+        await wait_for_host_async(limiter, host)
+    if on_send is not None:
+        on_send()
+    sent = time.monotonic()
+    if probe is not None:
+        with phases.timed("ttfb"):
+            status_code, retry_after = await probe_status_async(session, check_url, probe, phases)
+        if probe_settles(status_code):
+            return FetchOutcome(status_code, "", None, retry_after, time.monotonic() - sent, phases.seconds, 0,
+                                phases.spans)
+        with phases.timed("rate_limit"):
+            await wait_for_host_async(limiter, host)
+    
+    with phases.timed("ttfb"):
+        response = await session.get(check_url, allow_redirects=True, trace_request_ctx=phases)
+    async with response:
+        with phases.timed("download"):
+            reader = body_reader_for(api, response.status, response.charset)
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+    elapsed = time.monotonic() - sent
+    hits = reader.hits
+    if isinstance(reader, RawBodyReader):
+        # The event loop keeps serving other requests while a classifier process matches this page
+        with phases.timed("classify"):
+            hits = await asyncio.wrap_future(reader.submit())
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    return FetchOutcome(response.status, reader.text(), hits, retry_after, elapsed,
+                        phases.seconds, reader.bytes_read, phases.spans)
+
+async def fetch_attempt_async(session, limiter, host, check_url, api, probe, hedge_after=None):
+    """Asyncio counterpart of fetch_attempt; the losing request is cancelled"""
+    if hedge_after is None:
+        return await fetch_once_async(session, limiter, host, check_url, api, probe)
+    sent = asyncio.Event()
+    attempts = [asyncio.ensure_future(fetch_once_async(session, limiter, host, check_url, api, probe, sent.set))]
+    attempts[0].add_done_callback(lambda _: sent.set())
+    try:
+        await sent.wait()
+        done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+        if not done:
+            attempts.append(asyncio.ensure_future(fetch_once_async(session, limiter, host, check_url, api, probe)))
+        error = None
+        for next_done in asyncio.as_completed(attempts):
+            try:
+                return await next_done
+            except Exception as e:
+                error = e
+        raise error
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+
+async def fetch_check_async(session, check_url, api, probe):
+    """Asyncio counterpart of fetch_check"""
+    from aiohttp import ClientConnectionError, ClientPayloadError
+    
+    host = urlparse(check_url).hostname
+    limiter = get_rate_limiter()
+    policy = retry_policy_for(api)
+    rate_limited = failures = 0
+    while True:
+        try:
+            outcome = await fetch_attempt_async(session, limiter, host, check_url, api, probe, hedge_delay(host, policy))
+        except TIMEOUT_ERRORS:
+            raise
+        except (ClientConnectionError, ClientPayloadError):
+            failures += 1
+            if failures < policy.attempts:
+                await asyncio.sleep(backoff_delay(policy, failures))
+                continue
+            raise
+        limiter.record(host, outcome)
+        if outcome.status_code == 429 and rate_limited < RATE_LIMIT_RETRIES:
+            rate_limited += 1
+            continue
+        if outcome.status_code in RETRY_STATUSES:
+            failures += 1
+            if failures < policy.attempts:
+                await asyncio.sleep(backoff_delay(policy, failures))
+                continue
+        elif outcome.status_code != 429:
+            get_latency_history().record(host, outcome.elapsed)
+        return outcome
+
+async def wait_joined_async(future):
+    """Asyncio counterpart of wait_result for shared requests; cancelling the caller leaves the shared future alone"""
+    loop = asyncio.get_running_loop()
+    woken = loop.create_future()
+    
+    def wake(_):
+        try:
+            loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+        except RuntimeError:
+            pass  # the joiner's event loop has already closed
+    
+    future.add_done_callback(wake)
+    await woken
+    return future.result()
+
+async def fetch_coalesced_async(session, key):
+    """Asyncio counterpart of fetch_coalesced; can join requests made by thread scans too"""
+    inflight = get_inflight_requests()
+    while True:
+        future, owner = inflight.claim(key)
+        if owner:
+            break
+        try:
+            return await wait_joined_async(future)
+        except RequestAbandoned:
+            continue  # the owner's scan stopped; take the request over
+    try:
+        outcome = await fetch_check_async(session, *key)
+    except Exception as e:
+        inflight.settle(key, future, error=e)
+        raise
+    except BaseException:
+        # Cancelled owner: joiners retry the request instead of inheriting the cancellation
+        inflight.settle(key, future, error=RequestAbandoned())
+        raise
+    inflight.settle(key, future, outcome)
+    return outcome
+
+async def check_platforms_async(session, limiter, query, members, search_type="username", timeline=None):
+    """Asyncio counterpart of check_platforms"""
+    key = fetch_key(query, members[0], search_type)
+    host = urlparse(key[0]).hostname
+    dead = dead_host_results(query, members, search_type, host)
+    if dead is not None:
+        return dead
+    async with limiter:
+        lane = timeline.acquire_lane() if timeline is not None else None
+        started = time.monotonic()
+        spans = ()
+        try:
+            outcome = await fetch_coalesced_async(session, key)
+        except Exception as e:
+            if connect_failed_async(e):
+                get_dead_hosts().mark(host)
+                e = HostUnreachable(e)
+            results = build_results(query, members, search_type, error=e, elapsed=time.monotonic() - started)
+        else:
+            classifying = time.monotonic()
+            results = build_results(query, members, search_type, outcome, elapsed=outcome.elapsed)
+            spans = [*(outcome.spans or ()), ("classify", classifying, time.monotonic())]
+        if timeline is not None:
+            timeline.record_check(lane, host, results, started, time.monotonic(), spans)
+            timeline.release_lane(lane)
+    get_health_stats().record(results)
+    get_scan_metrics().record(results)
+    return results
+
+async def check_username_async(session, limiter, query, platform_name, platform_info, search_type="username"):
+    """Asyncio counterpart of check_username returning the same result dict"""
+    results = await check_platforms_async(session, limiter, query, [as_platform(platform_name, platform_info)], search_type)
+    return results[0]
+
+async def run_checks_async(checks, search_type="username", concurrency=ASYNC_CONCURRENCY, on_result=None,
+                           control=_UNBOUNDED):
+    """Run (query, members) checks on one event loop with at most `concurrency` requests in flight.
+
+    `on_result(query, result)` sees every result as it arrives. Once `control`
+    is stopped, outstanding checks are cancelled and reported as "pending".
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        raise RuntimeError("The async scan engine requires the aiohttp package") from None
+    
+    limiter = asyncio.Semaphore(concurrency)
+    # DNS goes through the process-wide cache shared with the thread engine
+    connector = aiohttp.TCPConnector(limit=concurrency, resolver=aiohttp_resolver(), use_dns_cache=False)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    # aiohttp cannot decode brotli bodies unless the optional brotli package is installed
+    headers = {**DEFAULT_HEADERS, "Accept-Encoding": "gzip, deflate"}
+    
+    results = []
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers,
+                                     cookie_jar=aiohttp.DummyCookieJar(),
+                                     trace_configs=[aiohttp_trace_config()]) as session:
+        tasks = {
+            asyncio.ensure_future(check_platforms_async(session, limiter, query, members, search_type,
+                                                        control.timeline)): (query, members)
+            for query, members in checks
+        }
+        
+        def emit(query, batch):
+            for result in batch:
+                results.append((query, result))
+                if on_result is not None:
+                    on_result(query, result)
+        
+        pending = set(tasks)
+        while pending and not control.stopped:
+            done, pending = await asyncio.wait(pending, timeout=STOP_POLL_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                emit(tasks[task][0], task.result())
+        
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in pending:
+            query, members = tasks[task]
+            if task.cancelled():
+                emit(query, build_results(query, members, search_type, error=ScanStopped()))
+            else:
+                emit(query, task.result())
+    return results
+
+async def scan_async(query, platforms, search_type="username", concurrency=ASYNC_CONCURRENCY, on_result=None,
+                     control=_UNBOUNDED):
+    """Check every platform for one query with run_checks_async; `on_result(result)` sees each result"""
+    checks = [(query, members) for members in scheduled_checks(query, platforms, search_type)]
+    callback = None if on_result is None else lambda _, result: on_result(result)
+    results = await run_checks_async(checks, search_type, concurrency, callback, control)
+    return [result for _, result in results]
+
+_SCAN_DONE = object()
+
+def iter_checks_async(checks, search_type="username", concurrency=ASYNC_CONCURRENCY, control=None):
+    """Yield (query, result) from the asyncio engine as checks complete"""
+    control = control or ScanControl()
+    results = queue.Queue()
+    failure = []
+    
+    def run_loop():
+        try:
+            asyncio.run(run_checks_async(checks, search_type, concurrency, lambda *item: results.put(item), control))
+        except Exception as e:
+            failure.append(e)
+        finally:
+            results.put(_SCAN_DONE)
+    
+    loop_thread = threading.Thread(target=run_loop, name="nametrace-async-scan", daemon=True)
+    loop_thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _SCAN_DONE:
+                break
+            yield item
+    finally:
+        # An abandoned iterator must not leave the event loop running or holding host tokens
+        control.cancel()
+        loop_thread.join(STOP_JOIN_TIMEOUT)
+    if failure:
+        raise failure[0]
+
+def iter_scan_async(query, platforms, search_type="username", concurrency=ASYNC_CONCURRENCY, control=None):
+    """Yield results from the asyncio engine as they complete"""
+    checks = [(query, members) for members in scheduled_checks(query, platforms, search_type)]
+    for _, result in iter_checks_async(checks, search_type, concurrency, control):
+        yield result
+
+def iter_checks_threaded(checks, search_type="username", max_workers=MAX_WORKERS, control=None):
+    """Yield (query, result) from the thread pool engine as (query, members) checks complete.
+
+    Once `control` is stopped, queued checks are cancelled, running ones are
+    abandoned (their requests end at the deadline) and both come back "pending".
+    """
+    control = control or ScanControl()
+    size_http_session(max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        for query, members in checks:
+            pending[executor.submit(check_platforms, query, members, search_type, control)] = (query, members)
+        while pending and not control.stopped:
+            done, _ = wait(pending, timeout=STOP_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                query, _ = pending.pop(future)
+                for result in future.result():
+                    yield query, result
+    finally:
+        # Never block on stragglers: queued checks are dropped, running ones wind down on their own
+        control.cancel()
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+    
+    for future, (query, members) in pending.items():
+        if future.done() and not future.cancelled():
+            results = future.result()
+        else:
+            results = build_results(query, members, search_type, error=ScanStopped())
+        for result in results:
+            yield query, result
+
+def iter_scan_threaded(query, platforms, search_type="username", max_workers=MAX_WORKERS, control=None):
+    """Yield results from the thread pool engine as they complete"""
+    checks = [(query, members) for members in scheduled_checks(query, platforms, search_type)]
+    for _, result in iter_checks_threaded(checks, search_type, max_workers, control):
+        yield result
+
+def iter_checks_distributed(checks, search_type="username", broker=None, control=None):
+    """Yield (query, result) for (query, members) checks run by worker processes through a broker.
+
+    Each check becomes one task, queued in scheduling order and run with
+    check_platforms by whichever worker claims it. Tasks the broker gave up
+    on after repeated worker failures come back as errors; once `control` is
+    stopped the scan's tasks are withdrawn and unfinished checks are "pending".
+    """
+    broker = broker or get_broker()
+    control = control or ScanControl()
+    scan_id = uuid.uuid4().hex
+    remaining = control.remaining()
+    # Workers run on other clocks, so the deadline travels as wall time
+    expires = None if remaining is None else time.time() + remaining
+    task_ids = broker.submit(scan_id, [
+        (query, search_type, [platform.name for platform in members], expires) for query, members in checks
+    ])
+    pending = dict(zip(task_ids, checks))
+    try:
+        while pending and not control.stopped:
+            delivered = broker.collect(scan_id)
+            if not delivered:
+                control.stop_event.wait(STOP_POLL_INTERVAL)
+                continue
+            for task_id, results in delivered:
+                query, members = pending.pop(task_id)
+                if results is None:
+                    error = RuntimeError("No worker completed the check before its attempts ran out")
+                    results = build_results(query, members, search_type, error=error)
+                # Workers keep their own stats; the coordinator's drive its scheduling and /metrics
+                get_health_stats().record(results)
+                get_scan_metrics().record(results)
+                for result in results:
+                    yield query, result
+    finally:
+        control.cancel()
+        broker.cancel(scan_id)
+    
+    for query, members in pending.values():
+        for result in build_results(query, members, search_type, error=ScanStopped()):
+            yield query, result
+
+def iter_checks(checks, search_type, engine, concurrency, control):
+    """Yield (query, result) for (query, members) checks with the selected engine"""
+    if engine == "distributed":
+        return iter_checks_distributed(checks, search_type, control=control)
+    if engine == "async":
+        return iter_checks_async(checks, search_type, concurrency or ASYNC_CONCURRENCY, control)
+    return iter_checks_threaded(checks, search_type, concurrency or MAX_WORKERS, control)
+
+def split_cached(query, platforms, search_type, cache):
+    """(fresh cached results, platforms that still need checking) for a query"""
+    cached_results = []
+    pending = {}
+    for name, info in platforms.items():
+        cached = cache.get((name, query, search_type))
+        if cached is None:
+            pending[name] = info
+        else:
+            cached_results.append(cached)
+    return cached_results, pending
+
+def iter_scan(query, platforms, search_type="username", engine="thread", concurrency=None, bypass_cache=False,
+              control=None):
+    """Run a scan with the selected engine, yielding each result as it arrives.
+
+    Fresh cached results are yielded first; `bypass_cache` re-checks every
+    platform but still refreshes the cache with the new results. A
+    ScanControl bounds the scan: checks unfinished when it is stopped or its
+    deadline passes are yielded with status "pending".
+    """
+    if engine not in SCAN_ENGINES:
+        raise ValueError(f"Unknown scan engine: {engine}")
+    return _iter_scan(query, platforms, search_type, engine, concurrency, bypass_cache, control or ScanControl())
+
+def _iter_scan(query, platforms, search_type, engine, concurrency, bypass_cache, control):
+    warm_host_cache()
+    cache = get_result_cache()
+    pending = platforms
+    if not bypass_cache:
+        cached_results, pending = split_cached(query, platforms, search_type, cache)
+        yield from cached_results
+    
+    checks = [(query, members) for members in scheduled_checks(query, pending, search_type)]
+    for _, result in iter_checks(checks, search_type, engine, concurrency, control):
+        if result["status"] != "pending":
+            cache.put((result["platform"], query, search_type), result)
+        yield result
+
+def iter_fanout(queries, platforms, search_type="username", engine="thread", concurrency=None, bypass_cache=False,
+                control=None):
+    """Scan several queries as one job, yielding each result with its "query" added.
+
+    Every query x platform check shares one worker pool (or event loop),
+    the pooled connections and the DNS cache, and runs in scheduled_fanout
+    order. Caching and ScanControl behave as in iter_scan.
+    """
+    if engine not in SCAN_ENGINES:
+        raise ValueError(f"Unknown scan engine: {engine}")
+    return _iter_fanout(list(queries), platforms, search_type, engine, concurrency, bypass_cache,
+                        control or ScanControl())
+
+def _iter_fanout(queries, platforms, search_type, engine, concurrency, bypass_cache, control):
+    warm_host_cache()
+    cache = get_result_cache()
+    targets = {}
+    for query in queries:
+        targets[query] = platforms
+        if not bypass_cache:
+            cached_results, targets[query] = split_cached(query, platforms, search_type, cache)
+            for result in cached_results:
+                yield {"query": query, **result}
+    
+    for query, result in iter_checks(scheduled_fanout(targets, search_type), search_type, engine, concurrency, control):
+        if result["status"] != "pending":
+            cache.put((result["platform"], query, search_type), result)
+        yield {"query": query, **result}
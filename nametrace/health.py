@@ -0,0 +1,138 @@
+"""Per-platform health statistics kept across scans, used to schedule checks."""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+
+# Health store: the last HEALTH_WINDOW checks of every platform
+HEALTH_PATH = os.environ.get("NAMETRACE_HEALTH_PATH", ".nametrace_health.sqlite3")
+HEALTH_WINDOW = 100
+HEALTH_FLUSH_INTERVAL = 5.0
+
+# A platform failing this often (with enough samples) is checked last
+BROKEN_FAILURE_RATE = 0.8
+BROKEN_MIN_SAMPLES = 10
+FAILURE_STATUSES = {"error", "timeout", "host_unreachable"}
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+class HealthStats:
+    """Recent check outcomes per platform: an in-memory window backed by a SQLite table"""
+
+    def __init__(self, path=HEALTH_PATH, window=HEALTH_WINDOW):
+        self.window = window
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.unsaved = []
+        self.flushed = time.monotonic()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS checks ("
+                "platform TEXT, recorded REAL, seconds REAL, status TEXT, response_code INTEGER)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS checks_platform ON checks (platform, recorded)")
+        rows = self.db.execute(
+            "SELECT platform, seconds, status, response_code FROM checks ORDER BY recorded"
+        ).fetchall()
+        for platform, seconds, status, response_code in rows:
+            self.samples[platform].append((seconds, status, response_code))
+
+    def record(self, results):
+        """Add finished checks; results without an "elapsed" time (cached, pending) are skipped"""
+        now = time.time()
+        with self.lock:
+            for result in results:
+                if result.get("elapsed") is None:
+                    continue
+                sample = (result["elapsed"], result["status"], result.get("response_code"))
+                self.samples[result["platform"]].append(sample)
+                self.unsaved.append((result["platform"], now, *sample))
+            if self.unsaved and time.monotonic() - self.flushed >= HEALTH_FLUSH_INTERVAL:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        with self.db:
+            self.db.executemany("INSERT INTO checks VALUES (?, ?, ?, ?, ?)", self.unsaved)
+            # Keep only each platform's newest HEALTH_WINDOW rows
+            self.db.execute(
+                "DELETE FROM checks WHERE rowid IN (SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER "
+                "(PARTITION BY platform ORDER BY recorded DESC) AS age FROM checks) WHERE age > ?)",
+                (self.window,)
+            )
+        self.unsaved = []
+        self.flushed = time.monotonic()
+
+    def platform_stats(self, name):
+        """Latency percentiles and failure rates for a platform, or None without samples"""
+        with self.lock:
+            samples = list(self.samples.get(name, ()))
+        if not samples:
+            return None
+        latencies = sorted(seconds for seconds, _, _ in samples)
+        count = len(samples)
+        failures = sum(1 for _, status, _ in samples if status in FAILURE_STATUSES)
+        return {
+            "checks": count,
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "error_rate": sum(1 for _, status, _ in samples if status in ("error", "host_unreachable")) / count,
+            "timeout_rate": sum(1 for _, status, _ in samples if status == "timeout") / count,
+            "rate_limited_rate": sum(1 for _, status, code in samples if status == "rate_limited" or code == 429) / count,
+            "broken": count >= BROKEN_MIN_SAMPLES and failures / count >= BROKEN_FAILURE_RATE,
+        }
+
+    def all_stats(self):
+        """name -> platform_stats for every platform with samples"""
+        with self.lock:
+            names = list(self.samples)
+        return {name: self.platform_stats(name) for name in sorted(names)}
+
+    def schedule(self, groups):
+        """Order check groups: longest expected job first, chronically broken platforms last.
+
+        Each group is a list of Platform records sharing a request; platforms
+        without history are assumed to take as long as a typical known one.
+        """
+        stats = {
+            platform.name: self.platform_stats(platform.name)
+            for members in groups for platform in members
+        }
+        known = sorted(s["p95"] for s in stats.values() if s is not None)
+        typical = percentile(known, 0.5) if known else 0.0
+
+        def priority(members):
+            member_stats = [stats[platform.name] for platform in members]
+            broken = all(s is not None and s["broken"] for s in member_stats)
+            expected = max(typical if s is None else s["p95"] for s in member_stats)
+            return (broken, -expected)
+
+        return sorted(groups, key=priority)
+
+_health_stats = None
+_health_path = HEALTH_PATH
+_health_stats_lock = threading.Lock()
+
+def set_health_path(path):
+    """Keep this process's health store at `path`; call before the first check"""
+    global _health_path
+    with _health_stats_lock:
+        _health_path = path
+
+def get_health_stats():
+    """Process-wide health store shared by every scan and engine"""
+    global _health_stats
+    with _health_stats_lock:
+        if _health_stats is None:
+            _health_stats = HealthStats(_health_path)
+            atexit.register(_health_stats.flush)
+        return _health_stats
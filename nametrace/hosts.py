@@ -0,0 +1,192 @@
+"""Shared DNS cache and dead-host list for registry hosts."""
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+
+from .metrics import connection_phase
+from .registry import platform_hosts
+
+# Seconds a resolved host stays cached, and a dead host is skipped before being retried
+DNS_CACHE_TTL = 300
+DEAD_HOST_TTL = 600
+WARMUP_WORKERS = 16
+
+class HostResolver:
+    """getaddrinfo results cached per host and shared by every worker and engine"""
+
+    def __init__(self, ttl=DNS_CACHE_TTL):
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def cached(self, host):
+        """Fresh cached addresses for a host, or None"""
+        with self.lock:
+            entry = self.entries.get(host)
+        return entry[1] if entry is not None and entry[0] > time.monotonic() else None
+
+    def addresses(self, host):
+        """[(family, ip), ...] for a host; raises socket.gaierror when it does not resolve"""
+        addresses = self.cached(host)
+        if addresses is not None:
+            return addresses
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            # Only a definite "no such name" condemns the host; a flaky resolver does not
+            if e.errno == socket.EAI_NONAME:
+                get_dead_hosts().mark(host)
+            raise
+        addresses = list(dict.fromkeys((family, sockaddr[0]) for family, _, _, _, sockaddr in infos))
+        with self.lock:
+            self.entries[host] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def pin(self, host, ip, family=socket.AF_INET):
+        """Resolve a host to a fixed address from now on (used to point hosts at a test server)"""
+        with self.lock:
+            self.entries[host] = (float("inf"), [(family, ip)])
+
+    def address(self, host):
+        """First cached address for a host, or None to let the caller resolve it"""
+        addresses = self.addresses_or_none(host)
+        return addresses[0] if addresses else None
+
+    def addresses_or_none(self, host):
+        """Every cached IP for a host in getaddrinfo order, or None to let the caller resolve it"""
+        try:
+            return [ip for _, ip in self.addresses(host)] or None
+        except OSError:
+            return None
+
+class DeadHosts:
+    """Hosts that recently failed to resolve or accept connections"""
+
+    def __init__(self, ttl=DEAD_HOST_TTL):
+        self.ttl = ttl
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def mark(self, host):
+        with self.lock:
+            self.expires[host] = time.monotonic() + self.ttl
+
+    def is_dead(self, host):
+        with self.lock:
+            expires = self.expires.get(host)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self.expires[host]
+                return False
+            return True
+
+_resolver = HostResolver()
+_dead_hosts = DeadHosts()
+
+def get_resolver():
+    """Process-wide DNS cache"""
+    return _resolver
+
+def get_dead_hosts():
+    """Process-wide dead-host list"""
+    return _dead_hosts
+
+_warmup_started = False
+_warmup_lock = threading.Lock()
+
+def warm_host_cache(hosts=None):
+    """Resolve every registry host once in the background; later calls do nothing"""
+    global _warmup_started
+    with _warmup_lock:
+        if _warmup_started:
+            return
+        _warmup_started = True
+    hosts = sorted(hosts or platform_hosts())
+
+    def warm():
+        with ThreadPoolExecutor(max_workers=WARMUP_WORKERS) as executor:
+            list(executor.map(_resolver.address, hosts))
+
+    threading.Thread(target=warm, name="nametrace-dns-warmup", daemon=True).start()
+
+class _CachedDNSMixin:
+    """Connect to the cached address; TLS still verifies and sends SNI for the real host name"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        with connection_phase("dns"):
+            candidates = _resolver.addresses_or_none(host) or [host]
+        try:
+            # Like urllib3's own resolution, a failed address falls through to the next (IPv6 -> IPv4, other
+            # A records); only when every one fails does the error reach connect_failed
+            for address in candidates[:-1]:
+                self._dns_host = address
+                try:
+                    with connection_phase("connect"):
+                        return super()._new_conn()
+                except ConnectTimeoutError:
+                    continue
+            self._dns_host = candidates[-1]
+            with connection_phase("connect"):
+                return super()._new_conn()
+        finally:
+            self._dns_host = host
+
+class CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+class CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    def connect(self):
+        # Everything connect() spends beyond resolving and opening the socket is the TLS handshake
+        with connection_phase("tls"):
+            super().connect()
+
+class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+class CachedDNSAdapter(HTTPAdapter):
+    """requests adapter whose new connections resolve through the shared DNS cache"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CachedDNSHTTPConnectionPool,
+            "https": CachedDNSHTTPSConnectionPool,
+        }
+
+_aiohttp_resolver_class = None
+
+def aiohttp_resolver():
+    """aiohttp resolver backed by the shared DNS cache (aiohttp is imported lazily)"""
+    global _aiohttp_resolver_class
+    if _aiohttp_resolver_class is None:
+        import asyncio
+        from aiohttp.abc import AbstractResolver
+
+        class CachedResolver(AbstractResolver):
+            async def resolve(self, host, port=0, family=socket.AF_INET):
+                addresses = _resolver.cached(host)
+                if addresses is None:
+                    addresses = await asyncio.get_running_loop().run_in_executor(None, _resolver.addresses, host)
+                return [
+                    {"hostname": host, "host": ip, "port": port, "family": addr_family,
+                     "proto": 0, "flags": socket.AI_NUMERICHOST}
+                    for addr_family, ip in addresses
+                    if family == socket.AF_UNSPEC or addr_family == family
+                ]
+
+            async def close(self):
+                pass
+
+        _aiohttp_resolver_class = CachedResolver
+    return _aiohttp_resolver_class()
@@ -0,0 +1,208 @@
+"""Per-check phase timing and Prometheus-style scan metrics."""
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Phases of a check in order; dns/connect/tls only appear when a new connection was opened
+PHASES = ["dns", "connect", "tls", "ttfb", "download", "classify"]
+
+# Histogram bucket upper bounds in seconds
+CHECK_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASE_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metrics endpoint: off unless a port is given here or on the command line
+METRICS_PORT = os.environ.get("NAMETRACE_METRICS_PORT")
+METRICS_HOST = "127.0.0.1"
+
+class RequestPhases:
+    """Seconds spent in each phase of one request, and (phase, start, end) spans for scan timelines"""
+
+    def __init__(self):
+        self.seconds = {}
+        self.recorded = 0.0
+        self.spans = []
+
+    def add(self, phase, seconds, started=None):
+        """Book `seconds` to a phase; with `started`, also keep the span [started, now]"""
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.recorded += seconds
+        if started is not None:
+            self.spans.append((phase, started, time.monotonic()))
+
+    @contextmanager
+    def timed(self, phase):
+        """Time a block as `phase`, minus phases recorded inside it (a connect inside a request, say)"""
+        started, recorded = time.monotonic(), self.recorded
+        try:
+            yield
+        finally:
+            self.add(phase, max(0.0, time.monotonic() - started - (self.recorded - recorded)), started)
+
+_capturing = threading.local()
+
+@contextmanager
+def capture_phases(phases):
+    """Let connections opened on this thread report their dns/connect/tls time into `phases`"""
+    previous = getattr(_capturing, "phases", None)
+    _capturing.phases = phases
+    try:
+        yield phases
+    finally:
+        _capturing.phases = previous
+
+def connection_phase(phase):
+    """Time a block on this thread's capturing RequestPhases, or do nothing when none is set"""
+    phases = getattr(_capturing, "phases", None)
+    return nullcontext() if phases is None else phases.timed(phase)
+
+def aiohttp_trace_config():
+    """aiohttp TraceConfig feeding dns/connect time into the RequestPhases passed as trace_request_ctx.
+
+    aiohttp opens TCP and TLS in one step, so the async engine reports TLS as part of connect.
+    """
+    import aiohttp
+
+    async def dns_start(session, context, params):
+        context.dns_started = time.monotonic()
+
+    async def dns_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx.add("dns", time.monotonic() - context.dns_started, context.dns_started)
+
+    async def connect_start(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.connect_started = (time.monotonic(), context.trace_request_ctx.recorded)
+
+    async def connect_end(session, context, params):
+        phases = context.trace_request_ctx
+        if phases is not None:
+            started, recorded = context.connect_started
+            phases.add("connect", max(0.0, time.monotonic() - started - (phases.recorded - recorded)), started)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(dns_start)
+    trace_config.on_dns_resolvehost_end.append(dns_end)
+    trace_config.on_connection_create_start.append(connect_start)
+    trace_config.on_connection_create_end.append(connect_end)
+    return trace_config
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield f"{name}_bucket{format_labels({**labels, 'le': str(bound)})} {cumulative}"
+        yield f"{name}_sum{format_labels(labels)} {self.sum:.6f}"
+        yield f"{name}_count{format_labels(labels)} {cumulative}"
+
+def format_labels(labels):
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+class ScanMetrics:
+    """Counters and latency histograms over every check run in this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checks = Counter()
+        self.bytes_received = Counter()
+        self.check_seconds = {}
+        self.phase_seconds = {}
+
+    def record(self, results):
+        """Count finished checks; results without an "elapsed" time (cached, pending) are skipped"""
+        with self.lock:
+            for result in results:
+                if result.get("elapsed") is None:
+                    continue
+                key = (result["platform"], result["status"])
+                self.checks[key] += 1
+                self.bytes_received[result["platform"]] += result.get("bytes_received") or 0
+                if key not in self.check_seconds:
+                    self.check_seconds[key] = Histogram(CHECK_SECONDS_BUCKETS)
+                self.check_seconds[key].observe(result["elapsed"])
+                for phase, seconds in (result.get("timings") or {}).items():
+                    if phase not in self.phase_seconds:
+                        self.phase_seconds[phase] = Histogram(PHASE_SECONDS_BUCKETS)
+                    self.phase_seconds[phase].observe(seconds)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        with self.lock:
+            lines = [
+                "# HELP nametrace_checks_total Finished platform checks by outcome.",
+                "# TYPE nametrace_checks_total counter",
+            ]
+            for (platform, status), count in sorted(self.checks.items()):
+                lines.append(f"nametrace_checks_total{format_labels({'platform': platform, 'status': status})} {count}")
+            lines += [
+                "# HELP nametrace_bytes_received_total Response body bytes read per platform.",
+                "# TYPE nametrace_bytes_received_total counter",
+            ]
+            for platform, count in sorted(self.bytes_received.items()):
+                lines.append(f"nametrace_bytes_received_total{format_labels({'platform': platform})} {count}")
+            lines += [
+                "# HELP nametrace_check_duration_seconds Time on the wire per check.",
+                "# TYPE nametrace_check_duration_seconds histogram",
+            ]
+            for (platform, status), histogram in sorted(self.check_seconds.items()):
+                lines.extend(histogram.lines("nametrace_check_duration_seconds", {"platform": platform, "status": status}))
+            lines += [
+                "# HELP nametrace_phase_duration_seconds Time per check spent in each phase.",
+                "# TYPE nametrace_phase_duration_seconds histogram",
+            ]
+            for phase in sorted(self.phase_seconds, key=PHASES.index):
+                lines.extend(self.phase_seconds[phase].lines("nametrace_phase_duration_seconds", {"phase": phase}))
+        return "\n".join(lines) + "\n"
+
+_scan_metrics = ScanMetrics()
+
+def get_scan_metrics():
+    """Process-wide metrics shared by every scan and engine"""
+    return _scan_metrics
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _scan_metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def start_metrics_server(port=None, host=METRICS_HOST):
+    """Serve /metrics on a background thread; later calls and an unset port do nothing"""
+    global _metrics_server
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, name="nametrace-metrics", daemon=True).start()
+        return _metrics_server
@@ -0,0 +1,80 @@
+"""Process pool that content-matches page bodies away from the I/O threads."""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .classify import CONTENT_MATCHER
+
+# Classifier processes; 0 matches pages inline while they stream (the default for interactive scans)
+CLASSIFY_WORKERS = int(os.environ.get("NAMETRACE_CLASSIFY_WORKERS", "0"))
+# Batch runs leave one core for the I/O threads
+BATCH_CLASSIFY_WORKERS = min(max((os.cpu_count() or 1) - 1, 0), 8)
+
+def match_page(body, encoding):
+    """Phrases found in a raw, size-capped page body; runs in a classifier process"""
+    try:
+        text = str(body, encoding or "utf-8", "replace")
+    except LookupError:
+        text = str(body, "utf-8", "replace")
+    return CONTENT_MATCHER.find_all(text.lower())
+
+_classifier_pool = None
+_classify_workers = CLASSIFY_WORKERS
+_classifier_pool_lock = threading.Lock()
+
+def set_classify_workers(workers):
+    """Classify with `workers` processes from now on (0 for inline); a running pool is replaced"""
+    global _classifier_pool, _classify_workers
+    with _classifier_pool_lock:
+        if workers == _classify_workers:
+            return
+        _classify_workers = workers
+        if _classifier_pool is not None:
+            _classifier_pool.shutdown(wait=False)
+            _classifier_pool = None
+
+def get_classifier_pool():
+    """Process-wide classifier pool, or None when pages are matched inline"""
+    global _classifier_pool
+    with _classifier_pool_lock:
+        if _classify_workers <= 0:
+            return None
+        if _classifier_pool is None:
+            # Forking a process full of I/O threads can copy held locks; spawn starts clean
+            _classifier_pool = ProcessPoolExecutor(
+                max_workers=_classify_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _classifier_pool
+
+def discard_classifier_pool(pool):
+    """Forget a broken pool (e.g. a process was killed for memory); the next page starts a fresh one"""
+    global _classifier_pool
+    with _classifier_pool_lock:
+        if _classifier_pool is pool:
+            _classifier_pool = None
+    pool.shutdown(wait=False)
+
+def submit_match(pool, body, encoding):
+    """Future of match_page(body, encoding) from the pool, matched inline if the pool has broken"""
+    matched = Future()
+    
+    def match_inline():
+        discard_classifier_pool(pool)
+        matched.set_result(match_page(body, encoding))
+    
+    def settle(future):
+        try:
+            matched.set_result(future.result())
+        except BrokenProcessPool:
+            match_inline()
+        except BaseException as e:
+            matched.set_exception(e)
+    
+    try:
+        pool.submit(match_page, body, encoding).add_done_callback(settle)
+    except (BrokenProcessPool, RuntimeError):
+        # RuntimeError: the pool was shut down by a concurrent discard or set_classify_workers
+        match_inline()
+    return matched
@@ -0,0 +1,132 @@
+"""Adaptive per-host token buckets."""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from .registry import registry_host_rates, registry_version
+
+# Per-host rate limiting; entries may set "rate_limit" (requests/second) for their host
+DEFAULT_HOST_RATE = 5.0
+DEFAULT_HOST_BURST = 5
+MIN_HOST_RATE = 0.2
+RATE_RECOVERY_STEP = 0.1
+RATE_LIMIT_RETRIES = 2
+MAX_RETRY_AFTER = 10
+RETRY_JITTER = 0.25
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket whose rate halves on each 429 and creeps back on successes"""
+
+    def __init__(self, rate, burst=DEFAULT_HOST_BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens may go negative: later callers queue behind earlier reservations
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def blocked_for(self):
+        """Seconds left of the current 429 back-off"""
+        with self.lock:
+            return max(0.0, self.blocked_until - time.monotonic())
+
+    def refund(self):
+        """Return a reserved token that was never used"""
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def penalize(self, retry_after=None):
+        """Back off after a 429, honoring Retry-After up to MAX_RETRY_AFTER"""
+        with self.lock:
+            self.rate = max(MIN_HOST_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            delay = retry_after if retry_after is not None else 1.0 / self.rate
+            delay = min(delay, MAX_RETRY_AFTER) * random.uniform(1.0, 1.0 + RETRY_JITTER)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+    def reward(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVERY_STEP)
+
+class HostRateLimiter:
+    """One adaptive token bucket per host"""
+
+    def __init__(self, host_rates=None, default_rate=DEFAULT_HOST_RATE):
+        self.host_rates = host_rates or {}
+        self.default_rate = default_rate
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.host_rates.get(host, self.default_rate))
+            return bucket
+
+    def set_host_rates(self, host_rates):
+        """Apply new configured rates, e.g. after the registry was reloaded"""
+        with self.lock:
+            self.host_rates = host_rates
+            for host, bucket in self.buckets.items():
+                rate = host_rates.get(host, self.default_rate)
+                with bucket.lock:
+                    bucket.max_rate = rate
+                    bucket.rate = min(bucket.rate, rate)
+
+    def reserve(self, host):
+        return self.bucket(host).reserve()
+
+    def refund(self, host):
+        self.bucket(host).refund()
+
+    def blocked_for(self, host):
+        return self.bucket(host).blocked_for()
+
+    def record(self, host, outcome):
+        """Adapt the host's rate to a finished request"""
+        if outcome.status_code == 429:
+            self.bucket(host).penalize(outcome.retry_after)
+        else:
+            self.bucket(host).reward()
+
+_rate_limiter = None
+_rate_limiter_version = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Process-wide per-host limiter shared by every scan and engine"""
+    global _rate_limiter, _rate_limiter_version
+    version = registry_version()
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = HostRateLimiter(registry_host_rates())
+        elif version != _rate_limiter_version:
+            _rate_limiter.set_host_rates(registry_host_rates())
+        _rate_limiter_version = version
+        return _rate_limiter
@@ -0,0 +1,270 @@
+"""Platform registry: loaded from platforms.json, validated and compiled once.
+
+The compiled registry is cached on disk next to the result cache and is
+reloaded automatically when the data file changes.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import quote, urlparse
+
+from .classify import PLATFORM_NOT_FOUND_RULES, not_found_rules_for
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_PATH = os.environ.get(
+    "NAMETRACE_REGISTRY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "platforms.json")
+)
+REGISTRY_CACHE_PATH = os.environ.get("NAMETRACE_REGISTRY_CACHE_PATH", ".nametrace_registry.json")
+# How often (seconds) the data file is checked for changes
+RELOAD_CHECK_INTERVAL = 2.0
+
+# Registry "probe" strategies: "head" sends HEAD, "range" asks for the first byte only.
+# The full page is fetched only when the probe status cannot settle the check.
+PROBE_STRATEGIES = ("head", "range")
+
+PLATFORM_KEYS = {"url", "check", "name_url", "supports_names", "api", "leak_db", "probe", "rate_limit"}
+USERNAME_PLACEHOLDER = "{username}"
+
+class RegistryError(ValueError):
+    """The platform data file is malformed"""
+
+class Platform(namedtuple("Platform", [
+    "name", "category", "url_parts", "check_parts", "name_url_parts",
+    "api", "leak_db", "probe", "rate_limit", "host", "not_found_rules",
+])):
+    """Compiled, immutable registry entry with pre-split URL templates"""
+    __slots__ = ()
+
+    @property
+    def supports_names(self):
+        return self.name_url_parts is not None
+
+    def uses_name_url(self, search_type):
+        return search_type == "name" and self.name_url_parts is not None
+
+    def urls(self, query, search_type="username"):
+        """Return the (check_url, display_url) pair for a query"""
+        # Choose appropriate URL based on search type
+        if self.uses_name_url(search_type):
+            return quote(query).join(self.name_url_parts), query.join(self.name_url_parts)
+        return quote(query).join(self.check_parts), query.join(self.url_parts)
+
+    def probe_for(self, search_type="username"):
+        """Probe to send first, or None when the full page is always needed"""
+        return None if self.uses_name_url(search_type) else self.probe
+
+def _template_parts(name, key, template):
+    if not isinstance(template, str) or USERNAME_PLACEHOLDER not in template:
+        raise RegistryError(f"{name}: {key} must be a URL containing {USERNAME_PLACEHOLDER}")
+    parts = template.split(USERNAME_PLACEHOLDER)
+    if any("{" in part or "}" in part for part in parts):
+        raise RegistryError(f"{name}: {key} has a placeholder other than {USERNAME_PLACEHOLDER}")
+    return tuple(parts)
+
+def _fixed_host(template):
+    host = urlparse(template).hostname
+    return host if host and "{" not in host else None
+
+def compile_platform(name, info, category=None):
+    """Validate one registry entry and compile it into a Platform"""
+    if not isinstance(info, dict):
+        raise RegistryError(f"{name}: entry must be an object")
+    unknown = set(info) - PLATFORM_KEYS
+    if unknown:
+        raise RegistryError(f"{name}: unknown keys {sorted(unknown)}")
+    for key in ("url", "check"):
+        if key not in info:
+            raise RegistryError(f"{name}: missing {key}")
+    probe = info.get("probe")
+    if probe is not None and probe not in PROBE_STRATEGIES:
+        raise RegistryError(f"{name}: unknown probe strategy {probe!r}")
+    if probe is not None and info.get("api", False):
+        # Only a 404 settles an API check, so a probe would just add a request before every GET
+        raise RegistryError(f"{name}: api entries cannot use a probe")
+    rate_limit = info.get("rate_limit")
+    if rate_limit is not None and (isinstance(rate_limit, bool) or not isinstance(rate_limit, (int, float)) or rate_limit <= 0):
+        raise RegistryError(f"{name}: rate_limit must be a positive number")
+
+    name_url_parts = None
+    if info.get("supports_names", False) and "name_url" in info:
+        name_url_parts = _template_parts(name, "name_url", info["name_url"])
+    return Platform(
+        name=name,
+        category=category,
+        url_parts=_template_parts(name, "url", info["url"]),
+        check_parts=_template_parts(name, "check", info["check"]),
+        name_url_parts=name_url_parts,
+        api=bool(info.get("api", False)),
+        leak_db=bool(info.get("leak_db", False)),
+        probe=probe,
+        rate_limit=rate_limit,
+        host=_fixed_host(info["check"]),
+        not_found_rules=not_found_rules_for(name),
+    )
+
+def as_platform(name, info):
+    """Accept a compiled Platform or a raw registry dict"""
+    return info if isinstance(info, Platform) else compile_platform(name, info)
+
+def load_registry(path=REGISTRY_PATH):
+    """Parse and compile a platforms.json file: {category: {name: entry}}"""
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise RegistryError(f"{path}: {e}") from None
+    if not isinstance(data, dict):
+        raise RegistryError(f"{path}: top level must map categories to platforms")
+
+    platforms = {}
+    for category, entries in data.items():
+        if not isinstance(entries, dict):
+            raise RegistryError(f"{category}: must map platform names to entries")
+        for name, info in entries.items():
+            if name in platforms:
+                raise RegistryError(f"{name}: defined more than once")
+            platforms[name] = compile_platform(name, info, category)
+    return platforms
+
+# Compiled records also depend on code-side data, so the disk cache is keyed on it too
+_COMPILER_FINGERPRINT = hashlib.sha1(
+    repr((Platform._fields, sorted(PLATFORM_NOT_FOUND_RULES.items()))).encode()
+).hexdigest()
+
+# Platform fields that are tuples in memory and lists in the JSON cache
+_TUPLE_FIELDS = ("url_parts", "check_parts", "name_url_parts")
+
+def _encode_platform(platform):
+    """JSON-ready fields of a Platform; not_found_rules is rebuilt from code on load"""
+    return {**platform._asdict(), "not_found_rules": None}
+
+def _decode_platform(fields):
+    for key in _TUPLE_FIELDS:
+        if fields[key] is not None:
+            fields[key] = tuple(fields[key])
+    fields["not_found_rules"] = not_found_rules_for(fields["name"])
+    return Platform(**fields)
+
+class Registry:
+    """Compiled registry that follows changes to its data file"""
+
+    def __init__(self, path=REGISTRY_PATH, cache_path=REGISTRY_CACHE_PATH):
+        self.path = path
+        self.cache_path = cache_path
+        self.lock = threading.Lock()
+        self.platforms = None
+        self.stamp = None
+        self.checked = 0.0
+        self.version = 0
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return (os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size, _COMPILER_FINGERPRINT)
+
+    def _load_cached(self, stamp):
+        # Any unreadable, foreign or stale file is just a cache miss
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if tuple(cached["stamp"]) != stamp:
+                return None
+            return {name: _decode_platform(fields) for name, fields in cached["platforms"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    def _store_cached(self, stamp, platforms):
+        cached = {"stamp": stamp, "platforms": {name: _encode_platform(p) for name, p in platforms.items()}}
+        # Written whole and renamed into place: UI, batch and worker processes may share the file
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(self.cache_path)))
+        except OSError:
+            return  # the on-disk copy is only a startup shortcut
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cached, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def current(self):
+        """Compiled platforms, reloading the data file if it changed"""
+        now = time.monotonic()
+        if self.platforms is not None and now - self.checked < RELOAD_CHECK_INTERVAL:
+            return self.platforms
+        with self.lock:
+            self.checked = now
+            try:
+                stamp = self._file_stamp()
+            except OSError:
+                if self.platforms is None:
+                    raise
+                logger.exception("Platform registry %s is unreadable", self.path)
+                return self.platforms
+            if stamp == self.stamp:
+                return self.platforms
+            platforms = self._load_cached(stamp)
+            if platforms is None:
+                try:
+                    platforms = load_registry(self.path)
+                except RegistryError:
+                    if self.platforms is None:
+                        raise
+                    # Keep scanning with the last good registry until the file is fixed
+                    logger.exception("Ignoring invalid platform registry %s", self.path)
+                    self.stamp = stamp
+                    return self.platforms
+                self._store_cached(stamp, platforms)
+            self.platforms = platforms
+            self.stamp = stamp
+            self.version += 1
+            return self.platforms
+
+_registry = Registry()
+
+def get_platforms():
+    """Current compiled platform registry, name -> Platform"""
+    return _registry.current()
+
+def registry_version():
+    """Increments every time the registry is (re)loaded"""
+    get_platforms()
+    return _registry.version
+
+def platform_hosts(platforms=None):
+    """Distinct fixed hosts contacted by the platform registry"""
+    hosts = set()
+    for platform in (platforms or get_platforms()).values():
+        for parts in (platform.check_parts, platform.name_url_parts):
+            if parts is not None:
+                host = _fixed_host(USERNAME_PLACEHOLDER.join(parts))
+                if host:
+                    hosts.add(host)
+    return hosts
+
+def registry_host_rates(platforms=None):
+    """Strictest "rate_limit" declared for each fixed registry host"""
+    rates = {}
+    for platform in (platforms or get_platforms()).values():
+        if platform.rate_limit is None:
+            continue
+        for parts in (platform.check_parts, platform.name_url_parts):
+            host = _fixed_host(USERNAME_PLACEHOLDER.join(parts)) if parts is not None else None
+            if host:
+                rates[host] = min(rates.get(host, platform.rate_limit), platform.rate_limit)
+    return rates
+
+def is_valid_query(query, search_type="username"):
+    """Same limits the UI applies to usernames and real names"""
+    if search_type == "username":
+        return bool(re.match(r'^[a-zA-Z0-9._-]+$', query)) and len(query) <= 50
+    return 2 <= len(query) <= 100
@@ -0,0 +1,65 @@
+"""Retry policies for transient failures and per-host latency history for hedging."""
+import random
+import threading
+from collections import defaultdict, deque, namedtuple
+
+# attempts: total tries for connection failures and 5xx gateway errors (timeouts are not retried)
+# hedge: send a duplicate request once an attempt outlives the host's p95 latency
+RetryPolicy = namedtuple("RetryPolicy", ["attempts", "base_delay", "max_delay", "hedge"])
+
+# APIs fail transiently more often but rate limit strictly, so they retry harder and never hedge
+RETRY_POLICIES = {
+    "page": RetryPolicy(attempts=2, base_delay=0.25, max_delay=2.0, hedge=True),
+    "api": RetryPolicy(attempts=3, base_delay=0.5, max_delay=4.0, hedge=False),
+}
+RETRY_STATUSES = {502, 503, 504}
+
+# Latency samples kept per host, and how many are needed before hedging kicks in
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+# Hedging only pays off against multi-second stalls, never against ordinary jitter
+HEDGE_MIN_DELAY = 1.0
+
+def platform_class(api):
+    """Retry policy class of a fetch key"""
+    return "api" if api else "page"
+
+def retry_policy_for(api):
+    return RETRY_POLICIES[platform_class(api)]
+
+def backoff_delay(policy, failures):
+    """Exponential backoff with full jitter before retry number `failures`"""
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** (failures - 1)))
+
+class LatencyHistory:
+    """Recent successful request latencies per host"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.lock = threading.Lock()
+
+    def record(self, host, seconds):
+        with self.lock:
+            self.samples[host].append(seconds)
+
+    def percentile(self, host, fraction=HEDGE_PERCENTILE, min_samples=HEDGE_MIN_SAMPLES):
+        """Latency percentile for a host, or None until enough samples exist"""
+        with self.lock:
+            samples = sorted(self.samples.get(host, ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+_latency_history = LatencyHistory()
+
+def get_latency_history():
+    """Process-wide latency history shared by every scan and engine"""
+    return _latency_history
+
+def hedge_delay(host, policy):
+    """Seconds after which an attempt on `host` gets a duplicate, or None for no hedging"""
+    if not policy.hedge:
+        return None
+    p95 = get_latency_history().percentile(host)
+    return None if p95 is None else max(p95, HEDGE_MIN_DELAY)
@@ -0,0 +1,91 @@
+"""Optional per-scan timeline of checks and their phases, exportable as Chrome trace events."""
+import heapq
+import json
+import threading
+import time
+from collections import namedtuple
+
+# One check (every platform sharing its request); times are offsets in seconds from the scan start
+# spans: [(phase, start, end), ...] inside the check
+TimelineCheck = namedtuple("TimelineCheck", ["lane", "host", "platforms", "status", "start", "end", "spans"])
+
+class ScanTimeline:
+    """Start/end of every check in one scan and of the phases inside it.
+
+    Checks run on numbered lanes, one per busy worker thread or in-flight
+    async request, so the timeline shows how the worker pool was occupied
+    and which checks queued behind slow ones.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.checks = []
+        self.free_lanes = []
+        self.lane_count = 0
+        self.lock = threading.Lock()
+
+    def acquire_lane(self):
+        """Lowest lane not running a check"""
+        with self.lock:
+            if self.free_lanes:
+                return heapq.heappop(self.free_lanes)
+            self.lane_count += 1
+            return self.lane_count - 1
+
+    def release_lane(self, lane):
+        with self.lock:
+            heapq.heappush(self.free_lanes, lane)
+
+    def record_check(self, lane, host, results, started, ended, spans=()):
+        """Add a finished check; `started`, `ended` and span times are time.monotonic() values"""
+        # Joined (coalesced) requests may have started before this check did
+        spans = [
+            (phase, max(start, started) - self.origin, min(end, ended) - self.origin)
+            for phase, start, end in spans
+            if end > started
+        ]
+        statuses = sorted({result["status"] for result in results})
+        check = TimelineCheck(
+            lane, host, [result["platform"] for result in results], "/".join(statuses),
+            started - self.origin, ended - self.origin, spans
+        )
+        with self.lock:
+            self.checks.append(check)
+
+    @property
+    def duration(self):
+        with self.lock:
+            return max((check.end for check in self.checks), default=0.0)
+
+    def lanes(self):
+        """lane -> its checks in start order"""
+        with self.lock:
+            checks = sorted(self.checks, key=lambda check: (check.lane, check.start))
+        lanes = {}
+        for check in checks:
+            lanes.setdefault(check.lane, []).append(check)
+        return lanes
+
+    def trace_events(self):
+        """Chrome trace-event document (about:tracing, Perfetto): one thread per lane"""
+        def micros(seconds):
+            return round(seconds * 1_000_000)
+
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "NameTrace scan"}}]
+        for lane, checks in self.lanes().items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": f"worker {lane}"}})
+            for check in checks:
+                events.append({
+                    "name": ", ".join(check.platforms), "cat": "check", "ph": "X", "pid": 1, "tid": lane,
+                    "ts": micros(check.start), "dur": micros(check.end - check.start),
+                    "args": {"host": check.host, "status": check.status},
+                })
+                for phase, start, end in check.spans:
+                    events.append({
+                        "name": phase, "cat": "phase", "ph": "X", "pid": 1, "tid": lane,
+                        "ts": micros(start), "dur": micros(end - start), "args": {"host": check.host},
+                    })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_json(self):
+        return json.dumps(self.trace_events())
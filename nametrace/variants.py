@@ -0,0 +1,42 @@
+"""Normalized username variants of real names and query lists, for fan-out scans."""
+import re
+import unicodedata
+
+from .registry import is_valid_query
+
+# Most variants traced for one input
+MAX_VARIANTS = 12
+
+def split_queries(text):
+    """Queries from comma- or newline-separated text"""
+    return [part.strip() for part in re.split(r"[,\n]", text) if part.strip()]
+
+def name_tokens(name):
+    """Lowercase ASCII words of a name: "José O'Neil" -> ["jose", "oneil"]"""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return [token for token in (re.sub(r"[^a-z0-9]", "", word) for word in ascii_name.lower().split()) if token]
+
+def name_variants(name):
+    """Common usernames built from a name's first and last words: john.doe, john_doe, johndoe, jdoe, ..."""
+    tokens = name_tokens(name)
+    if len(tokens) < 2:
+        return tokens
+    first, last = tokens[0], tokens[-1]
+    return [
+        f"{first}.{last}", f"{first}_{last}", f"{first}{last}", f"{first[0]}{last}",
+        f"{first}-{last}", f"{first}{last[0]}", f"{last}{first}", f"{last}.{first}",
+    ]
+
+def query_variants(queries, max_variants=MAX_VARIANTS):
+    """Deduplicated valid usernames for a list of queries.
+
+    Queries containing spaces are treated as names and expanded with
+    name_variants; anything else is taken as a username and lowercased.
+    """
+    variants = []
+    for query in queries:
+        candidates = name_variants(query) if " " in query.strip() else [query.strip().lower()]
+        for candidate in candidates:
+            if candidate not in variants and is_valid_query(candidate, "username"):
+                variants.append(candidate)
+    return variants[:max_variants]
@@ -0,0 +1,101 @@
+"""Stateless worker for the distributed scan engine: claim check tasks from a broker and run them.
+
+    NAMETRACE_BROKER=sqlite:///queue.sqlite3 python -m nametrace.worker --threads 20
+    python -m nametrace.worker --broker sqlite:////var/lib/nametrace/queue.sqlite3 --metrics-port 9101
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+from .broker import BROKER_URL, VISIBILITY_TIMEOUT, get_broker, open_broker
+from .engine import MAX_WORKERS, ScanControl, check_platforms, size_http_session
+from .health import set_health_path
+from .hosts import warm_host_cache
+from .metrics import start_metrics_server
+from .pool import set_classify_workers
+from .registry import get_platforms
+
+# Seconds an idle worker thread waits before asking the broker again
+WORKER_POLL_INTERVAL = 0.2
+# Workers keep their own health store; the coordinator records the same results in the main one
+WORKER_HEALTH_PATH = os.environ.get("NAMETRACE_WORKER_HEALTH_PATH", ".nametrace_worker_health.sqlite3")
+
+def task_control(task):
+    """ScanControl holding a task to what is left of its scan's deadline"""
+    if task.expires is None:
+        return ScanControl()
+    return ScanControl(deadline=max(0.0, task.expires - time.time()))
+
+def run_task(task):
+    """Results of one claimed task; names missing from this worker's registry raise KeyError"""
+    # Looked up per task so registry reloads reach long-running workers
+    platforms = get_platforms()
+    members = [platforms[name] for name in task.platforms]
+    return check_platforms(task.query, members, task.search_type, task_control(task))
+
+def run_worker(broker=None, threads=MAX_WORKERS, stop_event=None, poll_interval=WORKER_POLL_INTERVAL):
+    """Claim and run tasks on `threads` threads until `stop_event` is set.
+
+    Workers keep no scan state: a task names its platforms, which are looked
+    up in the local registry, so any number of them can serve one broker.
+    A task that raises is released for another attempt; one whose worker
+    dies comes back when its lease expires.
+    """
+    broker = broker or get_broker()
+    stop_event = stop_event or threading.Event()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    size_http_session(threads)
+    warm_host_cache()
+
+    def work():
+        while not stop_event.is_set():
+            task = broker.claim(worker_id)
+            if task is None:
+                stop_event.wait(poll_interval)
+                continue
+            try:
+                results = run_task(task)
+            except Exception as e:
+                print(f"Task {task.id} failed: {e!r}", file=sys.stderr)
+                broker.release(task.id)
+            else:
+                broker.complete(task.id, results)
+
+    pool = [threading.Thread(target=work, name=f"nametrace-worker-{i}", daemon=True) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run distributed scan checks from a work-queue broker")
+    parser.add_argument("--broker", default=BROKER_URL, help="broker URL (default: $NAMETRACE_BROKER)")
+    parser.add_argument("--threads", type=int, default=MAX_WORKERS, help="checks this worker runs at once")
+    parser.add_argument("--visibility-timeout", type=float, default=VISIBILITY_TIMEOUT,
+                        help="seconds a claimed task is hidden from other workers before it is retried")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on 127.0.0.1:PORT/metrics while running")
+    parser.add_argument("--classify-workers", type=int, default=0,
+                        help="processes that content-match pages (0: match on the I/O threads)")
+    args = parser.parse_args(argv)
+
+    if not args.broker:
+        parser.error("--broker or NAMETRACE_BROKER is required")
+
+    set_health_path(WORKER_HEALTH_PATH)
+    start_metrics_server(args.metrics_port)
+    set_classify_workers(args.classify_workers)
+    stop_event = threading.Event()
+    print(f"Worker {os.getpid()} serving {args.broker} with {args.threads} threads", file=sys.stderr)
+    try:
+        run_worker(open_broker(args.broker, visibility_timeout=args.visibility_timeout), args.threads, stop_event)
+    except KeyboardInterrupt:
+        stop_event.set()
+        # Running checks are abandoned; their leases expire and other workers retry them
+        return 130
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
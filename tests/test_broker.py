@@ -0,0 +1,81 @@
+"""Lease, retry, give-up and cancel behavior of the SQLite work-queue broker."""
+import pytest
+
+from nametrace import broker as broker_module
+from nametrace.broker import SQLiteBroker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(broker_module.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return SQLiteBroker(str(tmp_path / "queue.sqlite3"), visibility_timeout=10, max_attempts=2)
+
+def submit_one(queue, scan_id="scan"):
+    return queue.submit(scan_id, [("alice", "username", ["GitHub", "GitLab"], None)])[0]
+
+def test_claim_leases_task_and_hides_it(queue):
+    task_id = submit_one(queue)
+    task = queue.claim("w1")
+    assert task.id == task_id
+    assert (task.query, task.search_type, task.platforms, task.expires) == ("alice", "username", ["GitHub", "GitLab"], None)
+    assert queue.claim("w2") is None
+
+def test_tasks_are_claimed_in_submit_order(queue):
+    ids = queue.submit("scan", [("a", "username", ["X"], None), ("b", "username", ["Y"], None)])
+    assert [queue.claim("w").id, queue.claim("w").id] == ids
+
+def test_expired_lease_is_handed_out_again(queue, clock):
+    task_id = submit_one(queue)
+    queue.claim("crashed")
+    clock.now += 9
+    assert queue.claim("w2") is None
+    clock.now += 2
+    assert queue.claim("w2").id == task_id
+
+def test_task_gives_up_after_last_attempt(queue, clock):
+    task_id = submit_one(queue)
+    queue.claim("w1")
+    clock.now += 11
+    queue.claim("w2")
+    clock.now += 11
+    assert queue.claim("w3") is None
+    assert queue.collect("scan") == [(task_id, None)]
+
+def test_release_requeues_until_attempts_run_out(queue):
+    task_id = submit_one(queue)
+    queue.release(queue.claim("w1").id)
+    queue.release(queue.claim("w2").id)
+    assert queue.claim("w3") is None
+    assert queue.collect("scan") == [(task_id, None)]
+
+def test_only_first_completion_is_kept(queue, clock):
+    task_id = submit_one(queue)
+    slow = queue.claim("slow")
+    clock.now += 11
+    fast = queue.claim("fast")
+    assert slow.id == fast.id == task_id
+    queue.complete(fast.id, [{"platform": "GitHub", "status": "found"}])
+    queue.complete(slow.id, [{"platform": "GitHub", "status": "not_found"}])
+    assert queue.collect("scan") == [(task_id, [{"platform": "GitHub", "status": "found"}])]
+    assert queue.collect("scan") == []
+
+def test_cancel_drops_queued_tasks_and_late_results(queue):
+    submit_one(queue, "stopped")
+    running = queue.claim("w1")
+    submit_one(queue, "stopped")
+    kept = submit_one(queue, "other")
+    queue.cancel("stopped")
+    queue.complete(running.id, [{"platform": "GitHub", "status": "found"}])
+    assert queue.collect("stopped") == []
+    assert queue.claim("w2").id == kept
@@ -0,0 +1,132 @@
+"""Scan engine behavior: deadlines, classifier stalls and dead-host detection."""
+import errno
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from nametrace import cache, engine, health
+from nametrace.engine import ScanControl, check_platforms, connect_failed, iter_scan
+from nametrace.registry import compile_platform
+
+ENGINES = ["thread", pytest.param("async", marks=pytest.mark.skipif(
+    not engine.aiohttp_available(), reason="aiohttp is not installed"))]
+
+class HangingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(5)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+class ProfileHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<html>profile followers</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StuckPool:
+    """Classifier pool whose process never answers (hung, not dead)"""
+
+    def submit(self, fn, *args):
+        return Future()
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+@pytest.fixture
+def hanging_server():
+    server = serve(HangingHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+@pytest.fixture
+def profile_server():
+    server = serve(ProfileHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Throwaway result cache and health store; no registry DNS warm-up"""
+    monkeypatch.setattr(cache, "_result_cache", cache.ResultCache(str(tmp_path / "cache.sqlite3")))
+    monkeypatch.setattr(health, "_health_stats", health.HealthStats(str(tmp_path / "health.sqlite3")))
+    monkeypatch.setattr(engine, "warm_host_cache", lambda: None)
+    return cache._result_cache, health._health_stats
+
+@pytest.mark.parametrize("scan_engine", ENGINES)
+def test_deadline_leaves_checks_pending(hanging_server, stores, scan_engine):
+    result_cache, health_stats = stores
+    name = f"Hang-{scan_engine}"
+    url = f"{hanging_server}/{scan_engine}/{{username}}"
+    platforms = {name: compile_platform(name, {"url": url, "check": url})}
+
+    started = time.monotonic()
+    results = list(iter_scan("alice", platforms, engine=scan_engine, control=ScanControl(1)))
+
+    assert time.monotonic() - started < 4
+    assert [result["status"] for result in results] == ["pending"]
+    assert "elapsed" not in results[0]
+    assert result_cache.get((name, "alice", "username")) is None
+    assert health_stats.platform_stats(name) is None
+
+def test_stuck_classifier_gives_way_to_deadline(profile_server, stores, monkeypatch):
+    monkeypatch.setattr(engine, "get_classifier_pool", lambda: StuckPool())
+    url = f"{profile_server}/stuck/{{username}}"
+    platform = compile_platform("Stuck", {"url": url, "check": url})
+
+    started = time.monotonic()
+    results = check_platforms("alice", [platform], control=ScanControl(1))
+
+    assert time.monotonic() - started < 3
+    assert [result["status"] for result in results] == ["pending"]
+
+def connection_error(os_error):
+    """requests' error for a connect that failed with `os_error`, chained the way urllib3 does it"""
+    try:
+        raise NewConnectionError(None, f"Failed to establish a new connection: {os_error}") from os_error
+    except NewConnectionError as reason:
+        return requests.exceptions.ConnectionError(MaxRetryError(None, "/", reason))
+
+def test_refused_connection_condemns_host():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError) as refused:
+        requests.get(f"http://127.0.0.1:{port}/", timeout=5)
+    assert connect_failed(refused.value)
+
+@pytest.mark.parametrize("code", [errno.ENETUNREACH, errno.EHOSTUNREACH, errno.EMFILE, errno.ENOBUFS])
+def test_local_network_failures_do_not_condemn_host(code):
+    assert not connect_failed(connection_error(OSError(code, "local failure")))
+    assert connect_failed(connection_error(ConnectionRefusedError(errno.ECONNREFUSED, "refused")))
+
+def pool_maxsize(session):
+    return session.get_adapter("https://example.com")._pool_maxsize
+
+def test_http_pool_grows_with_scan_concurrency(monkeypatch):
+    monkeypatch.setattr(engine, "_http_session", None)
+    monkeypatch.setattr(engine, "_http_pool_size", engine.MAX_WORKERS)
+    assert pool_maxsize(engine.get_http_session()) == engine.MAX_WORKERS
+
+    engine.size_http_session(200)
+    assert pool_maxsize(engine.get_http_session()) == 200
+
+    shared = engine.get_http_session()
+    engine.size_http_session(50)
+    assert engine.get_http_session() is shared
@@ -0,0 +1,13 @@
+"""Registry entry validation."""
+import pytest
+
+from nametrace.registry import RegistryError, compile_platform, load_registry
+
+def test_api_entries_cannot_probe():
+    entry = {"url": "https://example.com/{username}", "check": "https://api.example.com/users/{username}", "api": True}
+    assert compile_platform("Example", entry).probe is None
+    with pytest.raises(RegistryError, match="api entries cannot use a probe"):
+        compile_platform("Example", {**entry, "probe": "head"})
+
+def test_shipped_registry_compiles():
+    assert not [platform.name for platform in load_registry().values() if platform.api and platform.probe]